@@ -0,0 +1,103 @@
+from AsyncServerConnection import AsyncServerConnection
+from PlayerSession import handleResult, handleResults
+from Aliases import jsonDict
+
+
+class AsyncPlayerSession:
+    """
+    An asyncio version of PlayerSession, with the same methods awaited instead of called.
+    Many sessions can share one event loop.
+    """
+    __slots__ = ("name", "password", "connection")  # class members
+
+    def __init__(self, name, password):
+        self.name = name
+        self.password = password
+
+    async def __aenter__(self):
+        self.connection = AsyncServerConnection()
+        await self.connection.open()
+        return self
+
+    async def login(self, data: jsonDict) -> int:
+        """
+        Logs the player to the game server.
+        :return: player id if login was successful
+        """
+        data["name"] = self.name
+
+        if self.password:
+            data["password"] = self.password
+
+        result = handleResult(await self.connection.login(data))
+
+        return int(result["idx"])
+
+    async def logout(self):
+        """
+        Logs out the player and removes the player's record from the server storage.
+        """
+        await self.connection.logout()
+
+    async def nextTurn(self):
+        """
+        Sends a TURN action, which forces the next turn of the game.
+        """
+        return handleResult(await self.connection.turn())
+
+    async def getMapInfo(self) -> jsonDict:
+        """
+        Returns the game map. Map represents static information about the game.
+        :return: data about the map
+        """
+        return handleResult(await self.connection.map())
+
+    async def getGameActions(self) -> jsonDict:
+        """
+        Gets a list of game actions that happened in the previous turn, representing changes between turns.
+
+        :return: data about the game actions
+        """
+        return handleResult(await self.connection.game_actions())
+
+    async def sendChatMessage(self, message):
+        """
+        Do nothing. Just for testing and fun.
+        :param message: message to be sent
+        """
+        handleResult(await self.connection.chat({"message": message}))
+
+    async def getGameState(self) -> jsonDict:
+        """
+        Returns the current state of the game. The game state represents dynamic information about the game.
+        :return: dictionary with game state
+        """
+        return handleResult(await self.connection.game_state())
+
+    async def move(self, data) -> jsonDict:
+        """
+        Changes vehicle position.
+        :param data: vehicle_id and target of the move.
+        """
+        return handleResult(await self.connection.move(data))
+
+    async def shoot(self, data):
+        """
+        Shoot to target position.
+        :param data: vehicle_id and target of the shot.
+        """
+        return handleResult(await self.connection.shoot(data))
+
+    async def pipeline(self, requests: list[tuple[int, jsonDict]]) -> list:
+        """
+        Sends several requests without waiting for each response, e.g. all the actions of a turn followed by TURN.
+        :param requests: list of tuples of the action code and the request data (or None)
+        :return: list with the data of each successful request and the exception of each failed one, in order
+        """
+        return handleResults(await self.connection.pipeline(requests))
+
+    async def __aexit__(self, *args):
+        """
+        Close connection to the server on exit
+        """
+        await self.connection.close()
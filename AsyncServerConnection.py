@@ -0,0 +1,167 @@
+import asyncio
+from Constants import Action
+from ServerConnection import ServerConnection, header, packRequest, parseResponse
+jsonDict = dict[str, any] # alias
+
+
+class AsyncServerConnection:
+    serverAddress = ServerConnection.serverAddress
+    serverPort = ServerConnection.serverPort
+
+
+    def __init__(self):
+        '''
+        Creates a connection, which has to be opened with open before sending requests.
+        '''
+        self.__reader = None
+        self.__writer = None
+        self.__lock = asyncio.Lock()  # keeps the frames of concurrent requests from interleaving
+
+
+
+    async def open(self) -> None:
+        '''
+        Opens a stream to the server.
+        '''
+        self.__reader, self.__writer = await asyncio.open_connection(self.serverAddress, self.serverPort)
+
+
+
+    async def __sendRequest(self, actionCode : int, data : jsonDict = None) -> jsonDict:
+        '''
+        Sends a request to the server and returns the response.
+
+        :param actionCode: The code of the action.
+        :param data: The request data dictionary.
+
+        :return: The response of the request.
+        '''
+        async with self.__lock:
+            # Send the message to the server
+            self.__writer.write(packRequest(actionCode, data))
+            await self.__writer.drain()
+
+            # Receive the response header, then the payload (if there's one)
+            resultCode, dataLen = header.unpack(await self.__reader.readexactly(header.size))
+            payload = await self.__reader.readexactly(dataLen) if dataLen else b""
+
+        return parseResponse(resultCode, payload, actionCode)
+
+
+    async def pipeline(self, requests : list[tuple[int, jsonDict]]) -> list[jsonDict]:
+        '''
+        Sends several requests back-to-back and then reads their responses, saving a round trip per request.
+
+        :param requests: A list of tuples of the action code and the request data dictionary (or None).
+
+        :return: The responses of the requests, in the same order.
+        '''
+        responses = []
+        async with self.__lock:
+            self.__writer.write(b"".join(packRequest(actionCode, data) for actionCode, data in requests))
+            await self.__writer.drain()
+
+            for actionCode, _ in requests:
+                resultCode, dataLen = header.unpack(await self.__reader.readexactly(header.size))
+                payload = await self.__reader.readexactly(dataLen) if dataLen else b""
+                responses.append(parseResponse(resultCode, payload, actionCode))
+
+        return responses
+
+
+    async def login(self, data : jsonDict) -> jsonDict:
+        '''
+        Logs in the player to the server. See ServerConnection.login for the expected data.
+
+        :param data: The login request data dictionary.
+
+        :return: The response of the request.
+        '''
+        return await self.__sendRequest(Action.LOGIN.value, data)
+
+
+    async def logout(self) -> jsonDict:
+        '''
+        Logs out the player and removes the player's record from the server storage.
+
+        :return: The response of the request.
+        '''
+        return await self.__sendRequest(Action.LOGOUT.value)
+
+
+    async def map(self) -> jsonDict:
+        '''
+        Gets the map, which represents static information about the game.
+
+        :return: The response of the request.
+        '''
+        return await self.__sendRequest(Action.MAP.value)
+
+
+    async def game_state(self) -> jsonDict:
+        '''
+        Gets the game state, which represents dynamic information about the game.
+
+        :return: The response of the request.
+        '''
+        return await self.__sendRequest(Action.GAME_STATE.value)
+
+
+    async def game_actions(self) -> jsonDict:
+        '''
+        Gets a list of game actions that happened in the previous turn, representing changes between turns.
+
+        :return: The response of the request.
+        '''
+        return await self.__sendRequest(Action.GAME_ACTIONS.value)
+
+
+    async def turn(self) -> jsonDict:
+        '''
+        Sends a TURN action, which forces the next turn of the game.
+
+        :return: The response of the request.
+        '''
+        return await self.__sendRequest(Action.TURN.value)
+
+
+    async def chat(self, data : jsonDict) -> jsonDict:
+        '''
+        Does nothing. Just for testing and fun.
+
+        :param data: The chat request data dictionary.
+
+        :return: The response of the request.
+        '''
+        return await self.__sendRequest(Action.CHAT.value, data)
+
+
+    async def move(self, data : jsonDict) -> jsonDict:
+        '''
+        Changes vehicle position.
+
+        :param data: The move request data dictionary with vehicle_id and target.
+
+        :return: The response of the request.
+        '''
+        return await self.__sendRequest(Action.MOVE.value, data)
+
+
+    async def shoot(self, data : jsonDict) -> jsonDict:
+        '''
+        Shoots to target position.
+
+        :param data: The shoot request data dictionary with vehicle_id and target.
+
+        :return: The response of the request.
+        '''
+        return await self.__sendRequest(Action.SHOOT.value, data)
+
+
+    async def close(self) -> None:
+        '''
+        Closes the stream to the server.
+        '''
+        if self.__writer is not None:
+            self.__writer.close()
+            await self.__writer.wait_closed()
@@ -10,11 +10,86 @@ from Tanks.HEAVY_TANK import HEAVY_TANK
 from Tanks.LIGHT_TANK import LIGHT_TANK
 from Tanks.MEDIUM_TANK import MEDIUM_TANK
 from Tanks.SPG import SPG
-from copy import deepcopy
 from collections import deque
-from Constants import HexTypes
-import itertools
+from Constants import HexTypes, HexFlags
 import heapq
+import time
+import io
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, resource_tracker
+
+
+class SearchTimeout(Exception):
+    """
+    Exception raised inside the action search when its deadline has passed.
+    """
+    pass
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """
+    Pickles a bot snapshot, leaving out the static objects that the worker processes already have.
+    """
+
+    def __init__(self, file, staticObjects: tuple) -> None:
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.__staticIds = {id(staticObject): index for index, staticObject in enumerate(staticObjects)}
+
+    def persistent_id(self, obj) -> int | None:
+        return self.__staticIds.get(id(obj))
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    """
+    Unpickles a bot snapshot, putting back the static objects of the worker process.
+    """
+
+    def __init__(self, file, staticObjects: tuple) -> None:
+        super().__init__(file)
+        self.__staticObjects = staticObjects
+
+    def persistent_load(self, pid: int):
+        return self.__staticObjects[pid]
+
+
+# the static objects of the bot, sent once when a worker process starts
+_workerStatic = ()
+# the bot snapshot last unpickled by a worker process, reused for the other subtrees of the same search
+_workerSnapshot = (None, None)
+
+
+def initializeWorker(staticObjects: bytes) -> None:
+    """
+    Worker process initializer of the parallel action search.
+
+    :param staticObjects: The pickled static objects of the bot.
+    """
+    global _workerStatic
+    _workerStatic = pickle.loads(staticObjects)
+
+
+def searchSubtree(snapshotId: int, snapshotName: str, snapshotSize: int, rootActions: list, deadline: float | None):
+    """
+    Worker process entry point of the parallel action search.
+
+    :param snapshotId: The ID of the snapshot, unique for every search.
+    :param snapshotName: The name of the shared memory holding the pickled bot the search is done on.
+    :param snapshotSize: The size of the pickled bot in bytes.
+    :param rootActions: The actions taken by the first tank, empty if it does nothing.
+    :param deadline: (Optional) The time.monotonic() value at which the search has to stop.
+    :return: A tuple of the best score and the best actions found in the subtree.
+    """
+    global _workerSnapshot
+    if _workerSnapshot[0] != snapshotId:
+        memory = shared_memory.SharedMemory(snapshotName)
+        try:
+            snapshot = bytes(memory.buf[:snapshotSize])
+        finally:
+            memory.close()
+        _workerSnapshot = (snapshotId, _SnapshotUnpickler(io.BytesIO(snapshot), _workerStatic).load())
+
+    return _workerSnapshot[1].searchActions(deadline, rootActions)
 
 
 class Bot:
@@ -23,32 +98,61 @@ class Bot:
         # new postion
         "RepairPositionBonus": 0.5,
         "CatapultPositionBonus": 1,
+        # anytime search
+        "MaxCandidateMoves": 3,
+        # parallel search, which isn't worth its overhead for fewer choices of the first tank or less time (seconds)
+        "ParallelMinRootActions": 4,
+        "ParallelMinTime": 0.05,
     }
 
-    def __init__(self, map: Map, eventManager: EventManager, movementSystem, shootingSystem,
-                 entityManagementSystem):
+    def __init__(self, map: Map, eventManager: EventManager, movementSystem, shootingSystem, threatMapSystem,
+                 entityManagementSystem, workers: int = 0):
         """
         Initializes the bot.
 
         :param map: An instance of the Map that holds static game information.
+        :param workers: (Optional) The number of worker processes the action search is split between.
+            The search runs in this process if it is less than 2, otherwise the workers are started right away.
         """
         self.__map = map
-        self.__canMoveTo = {HexTypes.EMPTY.value, HexTypes.BASE.value, HexTypes.CATAPULT.value,
-                            HexTypes.LIGHT_REPAIR.value, HexTypes.HARD_REPAIR.value}
-        self.__mapSize = self.__map.getSize()
         self.__baseMap = {}
         self.__catapultMap = {}
-        self.__hexPermutations = list(itertools.permutations([-1, 0, 1], 3))
         self.__teams = {}
         self.__initializeMap()
         self.__movementSystem = movementSystem
         self.__shootingSystem = shootingSystem
+        self.__threatMapSystem = threatMapSystem
         self.__tanks = {}
         self.__eventManager = eventManager
         self.__eventManager.addHandler(TankAddedEvent, self.onTankAdded)
         self.__entityManagementSystem = entityManagementSystem
         self.__turnOrder = [SPG, LIGHT_TANK, HEAVY_TANK, MEDIUM_TANK, AT_SPG]
         self.__player = entityManagementSystem.getOurPlayer()
+        self.__workers = workers
+        self.__executor = None
+        self.__snapshotCount = 0
+        # objects that don't change during the game, sent to the worker processes only once
+        self.__staticObjects = (self.__map, shootingSystem.getLinesOfFire())
+        if workers >= 2:
+            self.__startWorkers()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # worker processes get a snapshot of the bot without the process pool
+        state["_Bot__executor"] = None
+        return state
+
+    def __startWorkers(self) -> None:
+        """
+        Starts the worker processes of the parallel search, so that the searches don't wait for them.
+        """
+        # the workers share the resource tracker of this process, which removes the snapshots' shared memory
+        resource_tracker.ensure_running()
+        self.__executor = ProcessPoolExecutor(self.__workers, initializer=initializeWorker,
+                                              initargs=(pickle.dumps(self.__staticObjects, pickle.HIGHEST_PROTOCOL),))
+        # the processes are started on demand, one for every task that no idle process takes
+        for future in [self.__executor.submit(time.monotonic) for _ in range(self.__workers)]:
+            future.result()
 
     def getTanks(self) -> dict[Tank]:
         return self.__tanks
@@ -62,17 +166,6 @@ class Bot:
             if obj == HexTypes.BASE.value:
                 self.__path(position, self.__baseMap)
 
-    def __distance(self, position1: positionTuple, position2: positionTuple) -> int:
-        """
-        Returns the distance between two positions.
-
-        :param position1: The first position.
-        :param position2: The second position.
-        :return: The distance between the two positions.
-        """
-        return (abs(position1[0] - position2[0]) + abs(position1[1] - position2[1]) + abs(
-            position1[2] - position2[2])) // 2
-
     def onTankAdded(self, tankId: str, tankEntity: Tank) -> None:
         """
         Event handler. Adds the tank to the bot
@@ -94,8 +187,7 @@ class Bot:
         # Perform breadth-first search to find all possible moves
         while len(queue) > 0:
             currentPosition, currentDistance = queue.popleft()
-            currentPositionObject = self.__map.objectAt(currentPosition)
-            if not (currentPositionObject in self.__canMoveTo):
+            if not self.__map.flagsAt(currentPosition) & HexFlags.PASSABLE.value:
                 continue
 
             currentValue = valueMap.get(currentPosition)
@@ -109,9 +201,8 @@ class Bot:
             else:
                 valueMap[currentPosition] = value
 
-            for permutation in self.__hexPermutations:
-                newPosition = tuple(x + y for x, y in zip(currentPosition, permutation))
-                if all(abs(pos) < self.__mapSize for pos in newPosition) and newPosition not in visited:
+            for newPosition in self.__map.getNeighbours(currentPosition):
+                if newPosition not in visited:
                     visited.add(newPosition)
                     queue.append((newPosition, currentDistance + 1))
 
@@ -143,63 +234,63 @@ class Bot:
 
         return positions
 
-    def __getTotalDamages(self, tanks: list[int]):
-        totalDamages = {}
+    def __getPositionValue(self, tank: Tank, position: positionTuple) -> float:
+        """
+        Returns the value of a position for a tank, before adjusting it for the damage the tank could take there.
 
-        for tankId in tanks:
-            targetablePositions = self.__shootingSystem.getShootablePositions(tankId)
-            damage = self.__tanks[tankId].getComponent("shooting").damage
+        The value is never negative and adjusting it for damage can only lower it,
+        so it is also an upper bound of the tank's heuristic value at that position.
 
-            for position in targetablePositions:
-                totalDamages[position] = totalDamages.get(position, 0) + damage
+        :param tank: The tank that would stand on the position.
+        :param position: The position to evaluate.
+        :return: The value of the position.
+        """
+        value = self.__baseMap.get(position, self.__map.getDistance(position, (0, 0, 0)))
+        healthComponent = tank.getComponent("health")
+        missingHP = healthComponent.maxHealth - healthComponent.currentHealth
+        hasCatapult = tank.getComponent("shooting").rangeBonusEnabled
 
-        return totalDamages
+        # adjust values based on potential enemy targets that are capturing
+        totalValue = 0
+        flags = self.__map.flagsAt(position)
+        if flags & HexFlags.LIGHT_REPAIR.value:
+            if isinstance(tank, MEDIUM_TANK):
+                totalValue += (Bot.settings["RepairPositionBonus"] * missingHP)
+        elif flags & HexFlags.HARD_REPAIR.value:
+            if isinstance(tank, (AT_SPG, HEAVY_TANK)):
+                totalValue += (Bot.settings["RepairPositionBonus"] * missingHP)
+        elif flags & HexFlags.CATAPULT.value and self.__shootingSystem.catapultAvailable(
+                position) and not hasCatapult:
+            totalValue += Bot.settings["CatapultPositionBonus"]
+
+        return value + totalValue
 
     def __buildHeuristicMap(self, tank, tankId, movementOptions, currentPosition, damagedEnemies):
         tank = self.__tanks[tankId]
-        center = (0, 0, 0)
-        valueMap = {position: self.__baseMap.get(position, self.__distance(position, center)) for position in
-                    movementOptions}
-        valueMap[currentPosition] = self.__baseMap.get(currentPosition, self.__distance(currentPosition, center))
+        valueMap = {position: self.__getPositionValue(tank, position) for position in movementOptions}
+        valueMap[currentPosition] = self.__getPositionValue(tank, currentPosition)
         ownerId = tank.getComponent("owner").ownerId
         healthComponent = tank.getComponent("health")
         selfDestructionReward = tank.getComponent("destructionReward").destructionReward
-        hasCatapult = tank.getComponent("shooting").rangeBonusEnabled
-        maxHP = healthComponent.maxHealth
         currentHP = healthComponent.currentHealth
 
         enemyTanks = self.__getEnemyTanks(ownerId, damagedEnemies)
 
-        # adjust values based on potential enemy targets that are capturing
-        for position in valueMap.keys():
-            totalValue = 0
-            obj = self.__map.objectAt(position)
-            if obj == HexTypes.LIGHT_REPAIR.value:
-                if isinstance(tank, MEDIUM_TANK):
-                    totalValue += (Bot.settings["RepairPositionBonus"] * (maxHP - currentHP))
-            elif obj == HexTypes.HARD_REPAIR.value:
-                if isinstance(tank, (AT_SPG, HEAVY_TANK)):
-                    totalValue += (Bot.settings["RepairPositionBonus"] * (maxHP - currentHP))
-            elif obj == HexTypes.CATAPULT.value and self.__shootingSystem.catapultAvailable(
-                    position) and not hasCatapult:
-                totalValue += Bot.settings["CatapultPositionBonus"]
-
-            valueMap[position] += totalValue
-
         # adjust values based on potential damage taken
         damageValues = []
         for enemyTankList in enemyTanks:
             currentIndex = len(damageValues)
             damageValues.append({})
 
-            totalDamages = self.__getTotalDamages(enemyTankList)
-            for position, totalDamage in totalDamages.items():
-                if position in valueMap:
+            totalDamages = self.__threatMapSystem.getDamages(enemyTankList)
+            for position in valueMap:
+                totalDamage = totalDamages[self.__map.getCellId(position)]
+                if totalDamage > 0:
                     healthPartLeft = ((currentHP - totalDamage) / currentHP)
                     if healthPartLeft <= 0:
-                        obj = self.__map.objectAt(position)
-                        if (obj == "LightRepair" and isinstance(tank, MEDIUM_TANK)) or (
-                                obj == "HardRepair" and isinstance(tank, (AT_SPG, HEAVY_TANK))):
+                        flags = self.__map.flagsAt(position)
+                        if (flags & HexFlags.LIGHT_REPAIR.value and isinstance(tank, MEDIUM_TANK)) or (
+                                flags & HexFlags.HARD_REPAIR.value and isinstance(tank, (AT_SPG, HEAVY_TANK))):
                             continue
                         damageValues[currentIndex][position] = -selfDestructionReward
                     else:
@@ -217,12 +308,13 @@ class Bot:
 
         return valueMap
 
-    def __getBestMove(self, moves: list[positionTuple], tankId: int, damagedEnemies) -> list[positionTuple]:
+    def __getBestMove(self, moves: list[positionTuple], tankId: int, damagedEnemies,
+                      count: int = 1) -> list[positionTuple]:
         tank = self.__tanks[tankId]
         currentPosition = tank.getComponent("position").position
         heuristicMap = self.__buildHeuristicMap(tank, tankId, moves, currentPosition, damagedEnemies)
         heuristicMap.pop(currentPosition)
-        return [k for k, v in heapq.nlargest(1, heuristicMap.items(), key=lambda item: item[1])]
+        return [k for k, v in heapq.nlargest(count, heuristicMap.items(), key=lambda item: item[1])]
 
     def __getTileTypesInRange(self, movementOptions: list[positionTuple]) -> set:
         """
@@ -244,14 +336,13 @@ class Bot:
         return (type(allyTank).__name__ == "MEDIUM_TANK" and HexTypes.LIGHT_REPAIR.value in allTileTypes) \
                or (type(allyTank).__name__ in ("HEAVY_TANK", "AT_SPG") and HexTypes.HARD_REPAIR.value in allTileTypes)
 
-    # TODO: Improve evaluation
-    def __evaluateCurrentActions(self, currentActions, movement, damagedEnemies):
-        positionValue = 0
-        for tankId, positionChange in movement.items():
-            positionValue += \
-            self.__buildHeuristicMap(self.__tanks[tankId], tankId, [], positionChange[1], damagedEnemies)[
-                positionChange[1]]
+    def __getShootingScore(self, damagedEnemies) -> tuple[int, int, int]:
+        """
+        Sums up the results of the planned shots.
 
+        :param damagedEnemies: A dictionary of enemy tank IDs and their health after the planned shots.
+        :return: A tuple of denied capture points, destruction points and total damage.
+        """
         capturePointsDenied = 0
         destructionPoints = 0
         totalDamage = 0
@@ -262,70 +353,367 @@ class Bot:
                 capturePointsDenied += self.__tanks[damagedEnemyId].getComponent("capture").capturePoints
                 destructionPoints += self.__tanks[damagedEnemyId].getComponent("destructionReward").destructionReward
 
+        return capturePointsDenied, destructionPoints, totalDamage
+
+    @staticmethod
+    def __combineScore(positionValue, capturePointsDenied, destructionPoints, totalDamage) -> float:
+        """
+        Combines the parts of an evaluation into a single score. The score grows with every part.
+        """
         return positionValue + 3 ** (capturePointsDenied - 1) + destructionPoints * 1.3 + totalDamage * 0.05
 
-    def __findBestActionCombination(self):
+    # TODO: Improve evaluation
+    def __evaluateCurrentActions(self, currentActions, movement, damagedEnemies):
+        positionValue = 0
+        for tankId, positionChange in movement.items():
+            positionValue += \
+            self.__buildHeuristicMap(self.__tanks[tankId], tankId, [], positionChange[1], damagedEnemies)[
+                positionChange[1]]
+
+        return self.__combineScore(positionValue, *self.__getShootingScore(damagedEnemies))
+
+    def __getRemainingBounds(self, playerTanks: list[str], shootingOptions) -> list[tuple]:
+        """
+        Computes optimistic estimates of what the tanks from each turn order index onwards can still add to the score.
+
+        Tanks move from their starting positions and shooting options don't depend on our own tanks' positions,
+        so the estimates are computed once per search.
+
+        :param playerTanks: Our tank IDs in turn order.
+        :param shootingOptions: Shooting options of each of our tanks, in turn order.
+        :return: A list with an entry for every index, holding a tuple of the best position value,
+            the most damage that can be dealt and the most damage that can be dealt to each enemy tank.
+        """
+        bounds = [(0, 0, {})]
+
+        for tankIndex in range(len(playerTanks) - 1, -1, -1):
+            tankId = playerTanks[tankIndex]
+            tank = self.__tanks[tankId]
+            positionBound, damageBound, damageByEnemy = bounds[0]
+            damageByEnemy = dict(damageByEnemy)
+
+            # only our own tanks can leave their cells during the search
+            positions = self.__movementSystem.getMovementOptions(tankId)
+            positions += [self.__tanks[allyId].getComponent("position").position for allyId in playerTanks]
+            positionBound += max(0, max(self.__getPositionValue(tank, position) for position in positions))
+
+            damage = tank.getComponent("shooting").damage
+            damageBound += damage * max((len(targets) for _, targets in shootingOptions[tankIndex]), default=0)
+            for target in {target for _, targets in shootingOptions[tankIndex] for target in targets}:
+                damageByEnemy[target] = damageByEnemy.get(target, 0) + damage
+
+            bounds.insert(0, (positionBound, damageBound, damageByEnemy))
+
+        return bounds
+
+    def __getUpperBound(self, positionValue, damagedEnemies, remainingBounds) -> float:
+        """
+        Returns a score that no completion of the current partial action combination can beat.
+
+        :param positionValue: Upper bound of the position values of the tanks that already moved.
+        :param damagedEnemies: A dictionary of enemy tank IDs and their health after the planned shots.
+        :param remainingBounds: Estimates of what the remaining tanks can add, from __getRemainingBounds.
+        :return: The upper bound of the score.
+        """
+        positionBound, damageBound, damageByEnemy = remainingBounds
+        capturePointsDenied, destructionPoints, totalDamage = self.__getShootingScore(damagedEnemies)
+
+        # every enemy that the remaining tanks could finish off is counted as destroyed
+        for enemyId, damage in damageByEnemy.items():
+            health = damagedEnemies.get(enemyId)
+            if health is None:
+                health = self.__tanks[enemyId].getComponent("health").currentHealth
+            if 0 < health <= damage:
+                capturePointsDenied += self.__tanks[enemyId].getComponent("capture").capturePoints
+                destructionPoints += self.__tanks[enemyId].getComponent("destructionReward").destructionReward
+
+        return self.__combineScore(positionValue + positionBound, capturePointsDenied, destructionPoints,
+                                   totalDamage + damageBound)
+
+    def __getShotGain(self, targets: list[str], damage: int, damagedEnemies) -> tuple[int, int, int]:
+        """
+        Estimates the immediate gain of a shot, used to try the most promising shots first.
+
+        :param targets: The tank IDs that would be hit.
+        :param damage: The damage of the shot.
+        :param damagedEnemies: A dictionary of enemy tank IDs and their health after the planned shots.
+        :return: A tuple of capture points, destruction points and damage gained by the shot.
+        """
+        capturePoints = 0
+        destructionPoints = 0
+        totalDamage = 0
+        for target in targets:
+            health = damagedEnemies.get(target)
+            if health is None:
+                health = self.__tanks[target].getComponent("health").currentHealth
+            if health > 0:
+                totalDamage += damage
+                if health <= damage:
+                    capturePoints += self.__tanks[target].getComponent("capture").capturePoints
+                    destructionPoints += self.__tanks[target].getComponent("destructionReward").destructionReward
+
+        return capturePoints, destructionPoints, totalDamage
+
+    def searchActions(self, deadline: float | None = None, rootActions: list | None = None) -> tuple[float, list]:
+        """
+        Searches for the best combination of actions for our tanks.
+
+        Without a deadline the search runs to completion. With a deadline the search is repeated with
+        a growing number of branching tanks and candidate moves, while the tanks past the branching depth
+        take their most promising action. The best combination found so far is returned once the deadline passes,
+        the first pass, in which every tank takes its most promising action, always runs to completion.
+
+        :param deadline: (Optional) The time.monotonic() value at which the search has to stop.
+        :param rootActions: (Optional) The actions of the first tank. If provided, only the combinations
+            starting with them are searched.
+        :return: A tuple of the best score and the best list of actions.
+        """
         bestScore = -math.inf
         bestActions = []
         totalCombos = 0
 
-        def backtrack(currentActions, currentTankIndex, movement, damagedEnemies):
+        playerTanks = self.__player.getPlayerTanks()
+        shootingOptions = [self.__shootingSystem.getShootingOptions(tankId) for tankId in playerTanks]
+        remainingBounds = self.__getRemainingBounds(playerTanks, shootingOptions)
+
+        # the first, greedy pass isn't interrupted, so there are always actions to fall back on
+        activeDeadline = None
+
+        def backtrack(currentActions, currentTankIndex, movement, damagedEnemies, positionValue, searchDepth,
+                      moveWidth):
             nonlocal bestScore, bestActions, totalCombos
 
+            if activeDeadline is not None and time.monotonic() > activeDeadline:
+                raise SearchTimeout()
+
             if currentTankIndex == 5:
                 totalCombos += 1
                 # Evaluate the current move combination and update the best score and moves
                 score = self.__evaluateCurrentActions(currentActions, movement, damagedEnemies)
                 if score > bestScore:
                     bestScore = score
-                    bestActions = deepcopy(currentActions)
+                    bestActions = list(currentActions)
                 return
 
-            currentTankId = self.__player.getPlayerTanks()[currentTankIndex]
-            possibleMovement = self.__movementSystem.getMovementOptions(currentTankId)
-            possibleShoting = self.__shootingSystem.getShootingOptions(currentTankId)
-            currentPosition = self.__tanks[currentTankId].getComponent("position").position
+            # prune branches that can't beat the best combination found so far
+            if self.__getUpperBound(positionValue, damagedEnemies, remainingBounds[currentTankIndex]) <= bestScore:
+                return
 
-            targetPositions = self.__getBestMove(possibleMovement, currentTankId, damagedEnemies)
+            # tanks past the search depth only take their most promising action
+            isBranching = currentTankIndex < searchDepth
+            currentTankId = playerTanks[currentTankIndex]
+            currentTank = self.__tanks[currentTankId]
+            possibleMovement = self.__movementSystem.getMovementOptions(currentTankId)
+            currentPosition = currentTank.getComponent("position").position
+
+            # try the most promising shots first
+            currentDamage = currentTank.getComponent("shooting").damage
+            possibleShooting = sorted(shootingOptions[currentTankIndex], reverse=True,
+                                      key=lambda option: self.__getShotGain(option[1], currentDamage, damagedEnemies))
+            for targetPosition, targets in possibleShooting:
+                undoLog = self.__applyShot(targets, currentDamage, damagedEnemies)
+                if undoLog:
+                    currentActions.append(("shoot", currentTankId, targetPosition))
+                    try:
+                        backtrack(currentActions, currentTankIndex + 1, movement, damagedEnemies, positionValue,
+                                  searchDepth, moveWidth)
+                    finally:
+                        currentActions.pop()
+                        self.__undoShot(undoLog, damagedEnemies)
+
+                    if not isBranching:
+                        return
+
+            targetPositions = self.__getBestMove(possibleMovement, currentTankId, damagedEnemies,
+                                                 moveWidth if isBranching else 1)
             for targetPosition in targetPositions:
                 currentActions.append(("move", currentTankId, targetPosition))
+                savepoint = self.__movementSystem.savepoint()
                 self.__movementSystem.move(currentTankId, targetPosition)
-                movement[currentTankId] = [currentPosition, targetPosition]
-                backtrack(currentActions, currentTankIndex + 1, movement, damagedEnemies)
-                self.__movementSystem.move(currentTankId, currentPosition)
-                del movement[currentTankId]
-                currentActions.pop()
-
-            currentDamage = self.__tanks[currentTankId].getComponent("shooting").damage
-            for targetPosition, targets in possibleShoting:
-                shot = False
-                damagedEnemiesBacktrack = deepcopy(damagedEnemies)
-                for target in targets:
-                    if target in damagedEnemiesBacktrack:
-                        targetHealth = damagedEnemiesBacktrack[target]
-                    else:
-                        targetHealth = self.__tanks[target].getComponent("health").currentHealth
+                movement[currentTankId] = (currentPosition, targetPosition)
+                try:
+                    backtrack(currentActions, currentTankIndex + 1, movement, damagedEnemies,
+                              positionValue + self.__getPositionValue(currentTank, targetPosition), searchDepth,
+                              moveWidth)
+                finally:
+                    self.__movementSystem.rollback(savepoint)
+                    del movement[currentTankId]
+                    currentActions.pop()
 
-                    if targetHealth > 0:
-                        shot = True
-                        damagedEnemiesBacktrack[target] = targetHealth - currentDamage
+                if not isBranching:
+                    return
 
-                if shot:
-                    currentActions.append(("shoot", currentTankId, targetPosition))
-                    backtrack(currentActions, currentTankIndex + 1, movement, damagedEnemiesBacktrack)
-                    currentActions.pop()
+            backtrack(currentActions, currentTankIndex + 1, movement, damagedEnemies, positionValue, searchDepth,
+                      moveWidth)
 
-            backtrack(currentActions, currentTankIndex + 1, movement, damagedEnemies)
+        def search(currentActions, startIndex, movement, damagedEnemies, positionValue):
+            nonlocal activeDeadline
+            if deadline is None:
+                schedule = [(len(playerTanks), 1)]
+            else:
+                schedule = [(searchDepth, 1) for searchDepth in range(startIndex, len(playerTanks) + 1)]
+                schedule += [(len(playerTanks), moveWidth) for moveWidth in
+                             range(2, Bot.settings["MaxCandidateMoves"] + 1)]
+
+            for searchDepth, moveWidth in schedule:
+                try:
+                    backtrack(currentActions, startIndex, movement, damagedEnemies, positionValue, searchDepth,
+                              moveWidth)
+                except SearchTimeout:
+                    break
+                activeDeadline = deadline
+
+        # hypothetical moves don't reach the other systems, the shooting options were computed before them
+        with self.__eventManager.muted():
+            if rootActions is None:
+                search([], 0, {}, {}, 0)
+                return bestScore, bestActions
+
+            # take the given actions of the first tank and search the rest of the combinations
+            firstTankId = playerTanks[0]
+            firstTank = self.__tanks[firstTankId]
+            firstPosition = firstTank.getComponent("position").position
+            movement = {}
+            damagedEnemies = {}
+            positionValue = 0
+            savepoint = self.__movementSystem.savepoint()
+            try:
+                for actionType, tankId, targetPosition in rootActions:
+                    if actionType == "shoot":
+                        targets = dict(shootingOptions[0])[targetPosition]
+                        self.__applyShot(targets, firstTank.getComponent("shooting").damage, damagedEnemies)
+                    elif actionType == "move":
+                        self.__movementSystem.move(firstTankId, targetPosition)
+                        movement[firstTankId] = (firstPosition, targetPosition)
+                        positionValue += self.__getPositionValue(firstTank, targetPosition)
+
+                search(list(rootActions), 1, movement, damagedEnemies, positionValue)
+            finally:
+                self.__movementSystem.rollback(savepoint)
+
+            return bestScore, bestActions
+
+    def __applyShot(self, targets: list[str], damage: int, damagedEnemies) -> list[tuple]:
+        """
+        Applies a planned shot to the health of the enemies it hits.
+
+        :param targets: The IDs of the tanks hit by the shot.
+        :param damage: The damage of the shot.
+        :param damagedEnemies: A dictionary of enemy tank IDs and their health after the planned shots. Updated in place.
+        :return: The previous health of every target that was still alive, or None for ones that weren't damaged yet.
+        """
+        undoLog = []
+        for target in targets:
+            previousHealth = damagedEnemies.get(target)
+            if previousHealth is None:
+                targetHealth = self.__tanks[target].getComponent("health").currentHealth
+            else:
+                targetHealth = previousHealth
 
-        backtrack([], 0, {}, {})
+            if targetHealth > 0:
+                undoLog.append((target, previousHealth))
+                damagedEnemies[target] = targetHealth - damage
+
+        return undoLog
+
+    @staticmethod
+    def __undoShot(undoLog: list[tuple], damagedEnemies) -> None:
+        """
+        Reverts a shot applied by __applyShot.
+
+        :param undoLog: The list returned by __applyShot.
+        :param damagedEnemies: A dictionary of enemy tank IDs and their health after the planned shots. Updated in place.
+        """
+        for target, previousHealth in reversed(undoLog):
+            if previousHealth is None:
+                del damagedEnemies[target]
+            else:
+                damagedEnemies[target] = previousHealth
+
+    def __getRootActions(self, moveWidth: int) -> list[list]:
+        """
+        Lists the choices of the first tank, in the order the search tries them.
+
+        :param moveWidth: The number of candidate moves to include.
+        :return: A list of action lists, each containing at most one action.
+        """
+        tankId = self.__player.getPlayerTanks()[0]
+        tank = self.__tanks[tankId]
+        damage = tank.getComponent("shooting").damage
+        rootActions = []
+        for targetPosition, targets in sorted(self.__shootingSystem.getShootingOptions(tankId), reverse=True,
+                                              key=lambda option: self.__getShotGain(option[1], damage, {})):
+            if any(self.__tanks[target].getComponent("health").currentHealth > 0 for target in targets):
+                rootActions.append([("shoot", tankId, targetPosition)])
+
+        for targetPosition in self.__getBestMove(self.__movementSystem.getMovementOptions(tankId), tankId, {},
+                                                 moveWidth):
+            rootActions.append([("move", tankId, targetPosition)])
+
+        rootActions.append([])
+        return rootActions
+
+    def __findBestActionCombination(self, deadline: float | None = None):
+        """
+        Searches for the best combination of actions for our tanks, splitting the search
+        between worker processes by the choices of the first tank if there are enough workers.
+
+        :param deadline: (Optional) The time.monotonic() value at which the search has to stop.
+        :return: A list of actions.
+        """
+        if self.__workers < 2:
+            return self.searchActions(deadline)[1]
+
+        # with a deadline the search widens up to the maximum number of candidate moves
+        moveWidth = 1 if deadline is None else Bot.settings["MaxCandidateMoves"]
+        rootActions = self.__getRootActions(moveWidth)
+        if len(rootActions) < Bot.settings["ParallelMinRootActions"] or \
+                (deadline is not None and deadline - time.monotonic() < Bot.settings["ParallelMinTime"]):
+            return self.searchActions(deadline)[1]
+
+        # the snapshot is passed to the workers through shared memory, so it's sent once for all the subtrees
+        buffer = io.BytesIO()
+        _SnapshotPickler(buffer, self.__staticObjects).dump(self)
+        snapshot = buffer.getbuffer()
+        memory = shared_memory.SharedMemory(create=True, size=len(snapshot))
+        try:
+            memory.buf[:len(snapshot)] = snapshot
+            self.__snapshotCount += 1
+            futures = [self.__executor.submit(searchSubtree, self.__snapshotCount, memory.name, len(snapshot),
+                                              subtreeActions, deadline)
+                       for subtreeActions in rootActions]
+            results = [future.result() for future in futures]
+        finally:
+            memory.close()
+            memory.unlink()
+
+        # the workers stop at the deadline themselves, ties are resolved in the order the subtrees were submitted
+        bestScore = -math.inf
+        bestActions = []
+        for score, actions in results:
+            if score > bestScore:
+                bestScore = score
+                bestActions = actions
 
         return bestActions
 
-    def getActions(self) -> tuple[str, positionTuple]:
-        return self.__findBestActionCombination()
+    def getActions(self, deadline: float | None = None) -> list[tuple[str, str, positionTuple]]:
+        """
+        Chooses the actions for our tanks.
 
-        # either shooting chosen and no shooting options, or move chosen and no move options
-        return "none", (-1, -1, -1)
+        :param deadline: (Optional) The time.monotonic() value by which the actions have to be chosen.
+            If not provided, the search runs to completion.
+        :return: A list of actions, each represented as a tuple of the action type, tank ID and target position.
+        """
+        return self.__findBestActionCombination(deadline)
+
+    def close(self) -> None:
+        """
+        Shuts down the worker processes of the parallel search.
+        """
+        if self.__executor is not None:
+            self.__executor.shutdown(cancel_futures=True)
+            self.__executor = None
 
     def reset(self) -> None:
         """
@@ -1,6 +1,9 @@
-from enum import IntEnum, Enum
+from enum import IntEnum, IntFlag, Enum
+import itertools
 
 NUM_TANKS = 5  # number of each player tanks
+CAPTURE_POINTS_TO_WIN = 5  # capture points a player needs to win the game
+HEX_DIRECTIONS = tuple(itertools.permutations((-1, 0, 1), 3))  # offsets to the six neighbouring hexes
 
 
 class Result(IntEnum):
@@ -42,6 +45,19 @@ class HexTypes(Enum):
     CATAPULT = "Catapult"
 
 
+class HexFlags(IntFlag):
+    """
+    Bit flags describing the terrain of a hex.
+    """
+    NONE = 0
+    PASSABLE = 1
+    SHOOT_THROUGH = 2
+    BASE = 4
+    LIGHT_REPAIR = 8
+    HARD_REPAIR = 16
+    CATAPULT = 32
+
+
 class TankTypes(Enum):
     AT_SPG = "AT_SPG"
     HEAVY_TANK = "HEAVY_TANK"
@@ -13,23 +13,19 @@ class EntityManagementSystem:
         self.__ourPlayer = playerId
 
     def __initAllEntities(self, gameState: jsonDict):
-        for player in gameState["players"]:
-            idx = player["idx"]
-            name = player["name"]
-            if player["is_observer"]:
+        for idx, name, isObserver in gameState["players"]:
+            if isObserver:
                 self.__observers[idx] = Observer(idx, name)
             else:
                 playerTanks = self.__initPlayerTanks(idx, gameState)
                 self.__players[idx] = Player(idx, name, playerTanks)
 
     def addMissingEntities(self, gameState: jsonDict):
-        for entity in gameState["players"]:
-            if entity["idx"] in self.__players or entity["idx"] in self.__observers:
+        for idx, name, isObserver in gameState["players"]:
+            if idx in self.__players or idx in self.__observers:
                 continue
 
-            idx = entity["idx"]
-            name = entity["name"]
-            if entity["is_observer"]:
+            if isObserver:
                 self.__observers[idx] = Observer(idx, name)
             else:
                 playerTanks = self.__initPlayerTanks(idx, gameState)
@@ -41,8 +37,8 @@ class EntityManagementSystem:
 
         playerTanks = [None] * 5
         for tankId, tankData in gameState["vehicles"].items():
-            if tankData["player_id"] == playerId:
-                playerTanks[turnOrder.index(tankData["vehicle_type"])] = tankId
+            if tankData.playerId == playerId:
+                playerTanks[turnOrder.index(tankData.vehicleType)] = tankId
 
         return playerTanks
 
@@ -69,6 +65,12 @@ class EntityManagementSystem:
         self.__players.clear()
         self.__observers.clear()
 
+    def updatePoints(self, gameState: jsonDict) -> None:
+        for playerId, player in self.__players.items():
+            winPoints = gameState["win_points"].get(str(playerId))
+            if winPoints:
+                player.turn(winPoints["capture"], winPoints["kill"])
+
     def turn(self, gameState):
         currentPlayer = str(gameState["current_player_idx"])
         if int(currentPlayer) in self.__players:
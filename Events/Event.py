@@ -2,6 +2,7 @@ from abc import ABC
 from typing import Any, Callable
 from Events.EventExceptions import HandlerNotInEvent
 from Events.EventExceptions import HandlerArgumentMismatch
+from Events.EventStatistics import EventStatistics
 import inspect
 
 
@@ -9,17 +10,73 @@ class Event(ABC):
     """
     An abstract base class for events.
     """
+    # number of arguments the event is triggered with, None if not declared
+    argumentCount: int | None = None
 
-    def __init__(self) -> None:
-        self.__handlers = []
+    def __init__(self, strict: bool = False) -> None:
+        """
+        Initializes the event.
+
+        :param strict: (Optional) If True, the argument count of every trigger is checked against the handlers.
+            Meant for debugging, as it slows down triggering.
+        """
+        self.__strict = strict
+        self.__handlers = ()
+        self.__handlerArgumentCounts = ()
+        self.__batchHandlers = ()
+        self.__statistics = None
+
+    def setStatistics(self, statistics: EventStatistics | None) -> None:
+        """
+        Sets where the event records its statistics.
+
+        :param statistics: The statistics to record to, or None to stop recording.
+        """
+        self.__statistics = statistics
+
+    def __getArgumentCount(self, handler: Callable[..., None]) -> int:
+        """
+        Gets the number of arguments the handler takes.
+
+        :param handler: The handler to inspect.
+        :return: The number of arguments.
+        :raises HandlerArgumentMismatch: If the handler doesn't take the number of arguments declared by the event.
+        """
+        handlerArgumentCount = len(inspect.signature(handler).parameters)
+        if self.argumentCount is not None and handlerArgumentCount != self.argumentCount:
+            raise HandlerArgumentMismatch(
+                f"Handler {handler.__name__} takes {handlerArgumentCount} arguments, but {type(self).__name__} "
+                f"is triggered with {self.argumentCount}")
+
+        return handlerArgumentCount
 
     def addHandler(self, handler: Callable[..., None]) -> None:
         """
         Adds a new handler to the event.
 
         :param handler: The handler to add.
+        :raises HandlerArgumentMismatch: If the handler doesn't take the number of arguments declared by the event.
+        """
+        handlerArgumentCount = self.__getArgumentCount(handler)
+        self.__handlers += (handler,)
+        self.__handlerArgumentCounts += (handlerArgumentCount,)
+
+    def addBatchHandler(self, handler: Callable[[list[tuple]], None]) -> None:
         """
-        self.__handlers.append(handler)
+        Adds a new batch handler to the event.
+
+        A batch handler is called once with the list of argument tuples of all the triggers it handles,
+        after the regular handlers were called for each of them.
+
+        :param handler: The handler to add.
+        :raises HandlerArgumentMismatch: If the handler doesn't take exactly one argument.
+        """
+        handlerArgumentCount = len(inspect.signature(handler).parameters)
+        if handlerArgumentCount != 1:
+            raise HandlerArgumentMismatch(
+                f"Batch handler {handler.__name__} takes {handlerArgumentCount} arguments, but 1 is passed to it")
+
+        self.__batchHandlers += (handler,)
 
     def removeHandler(self, handler: Callable[..., None]) -> None:
         """
@@ -28,7 +85,13 @@ class Event(ABC):
         :param handler: The handler to remove.
         """
         if handler in self.__handlers:
-            self.__handlers.remove(handler)
+            index = self.__handlers.index(handler)
+            self.__handlers = self.__handlers[:index] + self.__handlers[index + 1:]
+            self.__handlerArgumentCounts = \
+                self.__handlerArgumentCounts[:index] + self.__handlerArgumentCounts[index + 1:]
+        elif handler in self.__batchHandlers:
+            index = self.__batchHandlers.index(handler)
+            self.__batchHandlers = self.__batchHandlers[:index] + self.__batchHandlers[index + 1:]
         else:
             raise HandlerNotInEvent(handler.__name__)
 
@@ -39,13 +102,80 @@ class Event(ABC):
         :param args: The positional arguments to pass to the handlers.
         :param kwargs: The keyword arguments to pass to the handlers.
         """
+        if self.__strict:
+            self.__validateArguments(self.__handlers, self.__handlerArgumentCounts, len(args) + len(kwargs))
+
+        if self.__batchHandlers and kwargs:
+            raise ValueError(f"Keyword arguments can't be passed to batch handlers of {type(self).__name__}")
+
+        if self.__statistics is not None:
+            self.__triggerMeasured(self.__handlers, self.__batchHandlers, [args], kwargs)
+            return
+
         for handler in self.__handlers:
-            signature = inspect.signature(handler)
-            signatureParamCount = len(signature.parameters)
-            passedParamCount = len(args) + len(kwargs)
+            handler(*args, **kwargs)
+
+        if self.__batchHandlers:
+            batch = [args]
+            for handler in self.__batchHandlers:
+                handler(batch)
+
+    def triggerBatch(self, batch: list[tuple]) -> None:
+        """
+        Triggers the event once for every argument tuple in the batch.
+
+        Regular handlers are called for each trigger in order, batch handlers are called once with the whole batch.
 
+        :param batch: A list of positional argument tuples.
+        """
+        if self.__strict:
+            for args in batch:
+                self.__validateArguments(self.__handlers, self.__handlerArgumentCounts, len(args))
+
+        if self.__statistics is not None:
+            self.__triggerMeasured(self.__handlers, self.__batchHandlers, batch, {})
+            return
+
+        for args in batch:
+            for handler in self.__handlers:
+                handler(*args)
+
+        for handler in self.__batchHandlers:
+            handler(batch)
+
+    def __triggerMeasured(self, handlers: tuple, batchHandlers: tuple, batch: list[tuple], kwargs: dict) -> None:
+        """
+        Triggers the event for every argument tuple in the batch, recording the statistics of the handler calls.
+
+        :param handlers: The handlers to call for each argument tuple.
+        :param batchHandlers: The handlers to call once with the whole batch.
+        :param batch: A list of positional argument tuples.
+        :param kwargs: The keyword arguments to pass to the handlers.
+        """
+        statistics = self.__statistics
+        eventName = type(self).__name__
+        statistics.enter(eventName, len(batch))
+        try:
+            for args in batch:
+                for handler in handlers:
+                    statistics.call(eventName, handler, *args, **kwargs)
+
+            for handler in batchHandlers:
+                statistics.call(eventName, handler, batch)
+        finally:
+            statistics.exit()
+
+    @staticmethod
+    def __validateArguments(handlers: tuple, handlerArgumentCounts: tuple, passedParamCount: int) -> None:
+        """
+        Checks that every handler takes the number of arguments passed to the event.
+
+        :param handlers: The handlers to check.
+        :param handlerArgumentCounts: The number of arguments each of the handlers takes.
+        :param passedParamCount: The number of arguments passed to the event.
+        :raises HandlerArgumentMismatch: If a handler takes a different number of arguments.
+        """
+        for handler, signatureParamCount in zip(handlers, handlerArgumentCounts):
             if signatureParamCount != passedParamCount:
                 raise HandlerArgumentMismatch(
                     f"Handler {handler.__name__} takes {signatureParamCount} arguments, but {passedParamCount} were passed to the event")
-
-            handler(*args, **kwargs)
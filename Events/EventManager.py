@@ -1,5 +1,7 @@
-from typing import Type, Any, Callable
+from typing import Type, Any, Callable, Iterator
+from contextlib import contextmanager
 from Events.Event import Event
+from Events.EventStatistics import EventStatistics
 from Events.EventExceptions import EventNotInManager
 from Events.EventExceptions import EventAlreadyInManager
 
@@ -7,8 +9,18 @@ class EventManager:
     """
     A class that manages events.
     """
-    def __init__(self) -> None:
+    def __init__(self, strict: bool = False) -> None:
+        """
+        Initializes the event manager.
+
+        :param strict: (Optional) If True, the events check the argument count of every trigger against their handlers.
+        """
+        self.__strict = strict
         self.__events = {}
+        self.__batchDepth = 0
+        self.__muteDepth = 0
+        self.__pendingEvents = {}
+        self.__statistics = None
 
     def registerEvent(self, eventType: Type[Event]) -> None:
         """
@@ -19,7 +31,37 @@ class EventManager:
         if eventType in self.__events:
             raise EventAlreadyInManager(eventType.__name__)
 
-        self.__events[eventType] = eventType()
+        self.__events[eventType] = eventType(self.__strict)
+        self.__events[eventType].setStatistics(self.__statistics)
+
+    def enableStatistics(self, sampleSize: int = 1000) -> EventStatistics:
+        """
+        Starts recording trigger counts, handler latencies and fan-out depths of all events.
+
+        :param sampleSize: (Optional) The number of most recent calls of each handler kept for computing percentiles.
+        :return: The statistics being recorded.
+        """
+        self.__statistics = EventStatistics(sampleSize)
+        for event in self.__events.values():
+            event.setStatistics(self.__statistics)
+
+        return self.__statistics
+
+    def disableStatistics(self) -> None:
+        """
+        Stops recording statistics.
+        """
+        self.__statistics = None
+        for event in self.__events.values():
+            event.setStatistics(None)
+
+    def getStatistics(self) -> EventStatistics | None:
+        """
+        Gets the statistics being recorded.
+
+        :return: The statistics, or None if they aren't enabled.
+        """
+        return self.__statistics
 
     def addHandler(self, eventType: Type[Event], handler: Callable[..., None]) -> None:
         """
@@ -33,6 +75,18 @@ class EventManager:
         else:
             raise EventNotInManager(eventType.__name__)
 
+    def addBatchHandler(self, eventType: Type[Event], handler: Callable[[list[tuple]], None]) -> None:
+        """
+        Adds a batch handler to the event with the given type.
+
+        :param eventType: The type of the event to add the handler to.
+        :param handler: The handler to add. It receives a list of argument tuples, one for each trigger.
+        """
+        if eventType in self.__events:
+            self.__events[eventType].addBatchHandler(handler)
+        else:
+            raise EventNotInManager(eventType.__name__)
+
     def removeHandler(self, eventType: Type[Event], handler: Callable[..., None]) -> None:
         """
         Removes a handler from the event with the given type.
@@ -53,7 +107,56 @@ class EventManager:
         :param args: The positional arguments to pass to the handlers.
         :param kwargs: The keyword arguments to pass to the handlers.
         """
-        if eventType in self.__events:
+        if eventType not in self.__events:
+            raise EventNotInManager(eventType.__name__)
+
+        if self.__muteDepth > 0:
+            return
+
+        if self.__batchDepth == 0:
             self.__events[eventType].trigger(*args, **kwargs)
+        elif kwargs:
+            raise ValueError(f"Keyword arguments can't be batched, {eventType.__name__} was triggered with {kwargs}")
         else:
-            raise EventNotInManager(eventType.__name__)
+            self.__pendingEvents.setdefault(eventType, []).append(args)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Defers the events triggered inside the context until it exits.
+
+        The deferred events are then dispatched grouped by event type, in the order each type was first triggered.
+        Events triggered by the handlers while dispatching are dispatched immediately.
+        Nested batches are dispatched when the outermost one exits and nothing is dispatched if it exits with an exception.
+        """
+        self.__batchDepth += 1
+        try:
+            yield
+        except BaseException:
+            self.__batchDepth -= 1
+            if self.__batchDepth == 0:
+                self.__pendingEvents.clear()
+            raise
+
+        self.__batchDepth -= 1
+        if self.__batchDepth == 0:
+            pendingEvents = self.__pendingEvents
+            self.__pendingEvents = {}
+            for eventType, batch in pendingEvents.items():
+                self.__events[eventType].triggerBatch(batch)
+
+    @contextmanager
+    def muted(self) -> Iterator[None]:
+        """
+        Drops the events triggered inside the context, no handler is called for them.
+
+        Used by the bot search for hypothetical moves, which are rolled back before the context exits.
+        The systems don't see these moves, so TankShootingSystem keeps the positions from before the context.
+        The search must not read positions from TankShootingSystem inside the context, its shooting options
+        have to be computed before any hypothetical move.
+        """
+        self.__muteDepth += 1
+        try:
+            yield
+        finally:
+            self.__muteDepth -= 1
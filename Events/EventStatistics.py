@@ -0,0 +1,145 @@
+from collections import deque
+from typing import Callable
+import time
+
+
+class HandlerStatistics:
+    """
+    Latency statistics of a single event handler.
+    """
+
+    def __init__(self, sampleSize: int) -> None:
+        """
+        Initializes the statistics.
+
+        :param sampleSize: The number of most recent calls kept for computing percentiles.
+        """
+        self.calls = 0
+        self.totalTime = 0  # nanoseconds
+        self.samples = deque(maxlen=sampleSize)
+
+    def record(self, elapsed: int) -> None:
+        """
+        Records a handler call.
+
+        :param elapsed: The duration of the call in nanoseconds.
+        """
+        self.calls += 1
+        self.totalTime += elapsed
+        self.samples.append(elapsed)
+
+    def percentile(self, percent: float) -> int:
+        """
+        Gets a latency percentile of the recent calls.
+
+        :param percent: The percentile to get, between 0 and 100.
+        :return: The latency in nanoseconds, 0 if there were no calls.
+        """
+        if not self.samples:
+            return 0
+
+        samples = sorted(self.samples)
+        return samples[min(len(samples) - 1, int(len(samples) * percent / 100))]
+
+
+class EventStatistics:
+    """
+    Collects trigger counts, handler latencies and fan-out depths of events.
+
+    Handler latencies are inclusive, they contain the time spent in the events triggered by the handler.
+    """
+
+    def __init__(self, sampleSize: int = 1000) -> None:
+        """
+        Initializes the statistics.
+
+        :param sampleSize: (Optional) The number of most recent calls of each handler kept for computing percentiles.
+        """
+        self.__sampleSize = sampleSize
+        self.__triggerCounts = {}  # dict[eventName, int]
+        self.__maxDepths = {}  # dict[eventName, int]
+        self.__handlers = {}  # dict[(eventName, handlerName), HandlerStatistics]
+        self.__depth = 0
+
+    def enter(self, eventName: str, count: int = 1) -> None:
+        """
+        Records the start of a trigger.
+
+        :param eventName: The name of the triggered event.
+        :param count: (Optional) The number of triggers dispatched together, for batches.
+        """
+        self.__depth += 1
+        self.__triggerCounts[eventName] = self.__triggerCounts.get(eventName, 0) + count
+        if self.__depth > self.__maxDepths.get(eventName, 0):
+            self.__maxDepths[eventName] = self.__depth
+
+    def exit(self) -> None:
+        """
+        Records the end of a trigger.
+        """
+        self.__depth -= 1
+
+    def call(self, eventName: str, handler: Callable[..., None], *args, **kwargs) -> None:
+        """
+        Calls the handler, recording how long the call took.
+
+        :param eventName: The name of the event the handler is called for.
+        :param handler: The handler to call.
+        :param args: The positional arguments to pass to the handler.
+        :param kwargs: The keyword arguments to pass to the handler.
+        """
+        key = (eventName, getattr(handler, "__qualname__", repr(handler)))
+        statistics = self.__handlers.get(key)
+        if statistics is None:
+            statistics = self.__handlers[key] = HandlerStatistics(self.__sampleSize)
+
+        start = time.perf_counter_ns()
+        try:
+            handler(*args, **kwargs)
+        finally:
+            statistics.record(time.perf_counter_ns() - start)
+
+    def getTriggerCounts(self) -> dict[str, int]:
+        """
+        :return: A dictionary of event names and the number of times they were triggered.
+        """
+        return dict(self.__triggerCounts)
+
+    def getMaxDepths(self) -> dict[str, int]:
+        """
+        :return: A dictionary of event names and the deepest nesting they were triggered at, 1 for top-level triggers.
+        """
+        return dict(self.__maxDepths)
+
+    def getHandlerStatistics(self) -> dict[tuple[str, str], HandlerStatistics]:
+        """
+        :return: A dictionary of (event name, handler name) tuples and the statistics of the handler.
+        """
+        return dict(self.__handlers)
+
+    def getSummary(self) -> str:
+        """
+        Formats the statistics as a table, with the handlers that took the most time first.
+
+        :return: The summary.
+        """
+        lines = ["Events:"]
+        for eventName, count in sorted(self.__triggerCounts.items(), key=lambda item: -item[1]):
+            lines.append(f"  {eventName}: {count} triggers, max depth {self.__maxDepths[eventName]}")
+
+        lines.append("Handlers (total ms, calls, p50/p90/p99 us):")
+        for (eventName, handlerName), statistics in sorted(self.__handlers.items(),
+                                                           key=lambda item: -item[1].totalTime):
+            lines.append(f"  {eventName} -> {handlerName}: {statistics.totalTime / 1e6:.2f}, {statistics.calls}, "
+                         f"{statistics.percentile(50) / 1e3:.1f}/{statistics.percentile(90) / 1e3:.1f}/"
+                         f"{statistics.percentile(99) / 1e3:.1f}")
+
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        """
+        Clears the collected statistics.
+        """
+        self.__triggerCounts.clear()
+        self.__maxDepths.clear()
+        self.__handlers.clear()
@@ -3,22 +3,22 @@ from Events.Event import Event
 # all events are stored here
 
 class TankAddedEvent(Event):
-    pass
+    argumentCount = 2  # tankId, tankEntity
 
 class TankMovedEvent(Event):
-    pass
+    argumentCount = 2  # tankId, newPosition
 
 class TankShotEvent(Event):
-    pass
+    argumentCount = 2  # tankId, damage
 
 class TankDestroyedEvent(Event):
-    pass
+    argumentCount = 1  # tankId
 
 class TankRespawnedEvent(Event):
-    pass
+    argumentCount = 1  # tankId
 
 class TankRangeBonusEvent(Event):
-    pass
+    argumentCount = 1  # tankId
 
 class TankRepairedEvent(Event):
-    pass
\ No newline at end of file
+    argumentCount = 1  # tankId
@@ -0,0 +1,103 @@
+from multiprocessing import shared_memory
+import struct
+
+# colors and labels of the hexes, a frame holds their indexes
+COLORS = ("white", "green", "grey0", "red", "HotPink3", "HotPink4", "orange", "purple", "blue")
+LABELS = ("", "CP", "LR", "HR", "TD", "HT", "LT", "MT", "SPG")
+
+
+class FrameBuffer:
+    """
+    A frame of the board in shared memory, written by the game process and read by the display process.
+
+    The buffer starts with a sequence number and a stop flag, followed by the color codes and the label codes of
+    every hex, indexed by hex id. The sequence number is odd while a frame is being written, so the reader can detect
+    and skip frames it read halfway through a write.
+    """
+    header = struct.Struct("<QB")  # sequence number, stop flag
+
+    def __init__(self, cellCount: int, name: str | None = None) -> None:
+        """
+        Creates a new frame buffer or attaches to an existing one.
+
+        :param cellCount: The number of hexes on the map.
+        :param name: (Optional) The name of an existing frame buffer to attach to.
+        """
+        self.__owner = name is None
+        self.__memory = shared_memory.SharedMemory(name, self.__owner, self.header.size + 2 * cellCount)
+        self.__sequence = 0
+
+        colorsStart = self.header.size
+        labelsStart = colorsStart + cellCount
+        self.__colors = self.__memory.buf[colorsStart:labelsStart]
+        self.__labels = self.__memory.buf[labelsStart:labelsStart + cellCount]
+
+        if self.__owner:
+            self.header.pack_into(self.__memory.buf, 0, 0, 0)
+
+    def getName(self) -> str:
+        """
+        Gets the name of the shared memory, used to attach to the frame buffer.
+
+        :return: The name of the frame buffer.
+        """
+        return self.__memory.name
+
+    def write(self, colors: bytes, labels: bytes) -> None:
+        """
+        Writes a frame.
+
+        :param colors: The color code of every hex, indexed by hex id.
+        :param labels: The label code of every hex, indexed by hex id.
+        """
+        self.__sequence += 1
+        self.header.pack_into(self.__memory.buf, 0, self.__sequence, 0)
+        self.__colors[:] = colors
+        self.__labels[:] = labels
+        self.__sequence += 1
+        self.header.pack_into(self.__memory.buf, 0, self.__sequence, 0)
+
+    def read(self, lastSequence: int) -> tuple[int, bytes, bytes] | None:
+        """
+        Reads the current frame if it's newer than the last one read.
+
+        :param lastSequence: The sequence number of the last frame read, 0 if none was read.
+        :return: A tuple of the sequence number, color codes and label codes of the frame,
+            or None if there's no new complete frame.
+        """
+        sequence, _ = self.header.unpack_from(self.__memory.buf, 0)
+        if sequence == lastSequence or sequence & 1:
+            return None
+
+        colors = bytes(self.__colors)
+        labels = bytes(self.__labels)
+
+        # the frame was overwritten while it was being copied
+        if self.header.unpack_from(self.__memory.buf, 0)[0] != sequence:
+            return None
+
+        return sequence, colors, labels
+
+    def stop(self) -> None:
+        """
+        Tells the reader to stop.
+        """
+        self.header.pack_into(self.__memory.buf, 0, self.__sequence, 1)
+
+    def isStopped(self) -> bool:
+        """
+        Checks if the reader was told to stop.
+
+        :return: True if the reader should stop, False otherwise.
+        """
+        return self.header.unpack_from(self.__memory.buf, 0)[1] == 1
+
+    def close(self) -> None:
+        """
+        Detaches from the shared memory. The process that created the frame buffer also frees it.
+        """
+        self.__colors.release()
+        self.__labels.release()
+        self.__memory.close()
+        if self.__owner:
+            self.__memory.unlink()
@@ -5,52 +5,124 @@ from Utils import hexToTuple
 from Utils import tupleToHex
 from ServerConnection import Action
 import logging
+import time
 from Aliases import jsonDict
 from World import World
+from Replay import ReplayWriter
 
 
 class Game:
-    def __init__(self, session: PlayerSession, data: jsonDict) -> None:
+    def __init__(self, session: PlayerSession, data: jsonDict, timeBudget: float | None = None,
+                 workers: int = 0, eventStatistics: bool = False, deltaSync: bool = False,
+                 headless: bool = False, replayPath: str | None = None) -> None:
         self.__session = session
+        self.__timeBudget = timeBudget  # seconds the bot can spend choosing actions, None for no limit
+        self.__deltaSync = deltaSync  # follow other players' turns through GAME_ACTIONS instead of GAME_STATE
+        if deltaSync and replayPath is not None:
+            # the replay records the game state, which isn't kept up to date in delta sync mode
+            logging.info("Delta sync is turned off while recording a replay")
+            self.__deltaSync = False
+        self.__fullSync = False  # a turn may have been missed, so the next sync fetches the whole game state
         self.__playerID = self.__session.login(data)
 
         # Get static map data
         self.__map = self.__session.getMapInfo()
-        self.__gameState = self.__session.getGameState()
-        self.__world = World(self.__map, self.__gameState, self.__playerID)
-        self.__player = self.__world.getEntityManagementSystem().getPlayer(self.__playerID)
-        self.__previousPlayer = None
-        self.__turn()
-        self.__bot = self.__world.getBot()
-        self.__run()
+        self.__replayWriter = ReplayWriter(replayPath, self.__map) if replayPath is not None else None
+        try:
+            self.__gameState = self.__session.getGameState()
+            self.__world = World(self.__map, self.__gameState, self.__playerID, workers, eventStatistics, headless)
+            self.__player = self.__world.getEntityManagementSystem().getPlayer(self.__playerID)
+            self.__previousPlayer = None
+            self.__turn()
+            self.__bot = self.__world.getBot()
+            self.__run()
+        finally:
+            if self.__replayWriter is not None:
+                self.__replayWriter.close()
         self.__session.logout()
 
     def __reset(self):
         self.__previousPlayer = None
         self.__gameState = self.__session.getGameState()
-        self.__world.resetSystems(self.__gameState)
+        self.__world.reconcile(self.__gameState)
         self.__turn()
         self.__player = self.__world.getEntityManagementSystem().getPlayer(self.__playerID)
 
     def __selfTurn(self):
-        actions = self.__bot.getActions()
-        
-        for action in actions:
-            if action[0] == "shoot":
-                self.__session.shoot({"vehicle_id": int(action[1]), "target": tupleToHex(action[2])})
+        deadline = None if self.__timeBudget is None else time.monotonic() + self.__timeBudget
+        actions = self.__bot.getActions(deadline)
+
+        # send all the actions and the end of the turn at once, then apply the ones the server accepted
+        actionCodes = {"shoot": Action.SHOOT.value, "move": Action.MOVE.value}
+        requests = [(actionCodes[action[0]], {"vehicle_id": int(action[1]), "target": tupleToHex(action[2])})
+                    for action in actions]
+        requests.append((Action.TURN.value, None))
+        results = self.__session.pipeline(requests)
+
+        for action, result in zip(actions, results):
+            if isinstance(result, Exception):
+                logging.debug(f"{result.__class__.__name__}:{result.message}")
+            elif action[0] == "shoot":
                 self.__world.shoot(action[1], action[2])
             elif action[0] == "move":
-                self.__session.move({"vehicle_id": int(action[1]), "target": tupleToHex(action[2])})
                 self.__world.move(action[1], action[2])
 
-        self.__session.nextTurn()
+        if isinstance(results[-1], Exception):
+            raise results[-1]
 
     def __otherTurn(self):
         # skip turn since it's not our
         self.__session.nextTurn()
-        self.__reset()
+        if not self.__deltaSync:
+            self.__reset()
+
+    def __sync(self) -> None:
+        """
+        Brings the game state and the world up to date after a turn has passed.
+        """
+        if self.__deltaSync and not self.__fullSync and self.__applyGameActions():
+            return
+
+        self.__fullSync = False
+        self.__gameState = self.__session.getGameState()
+        if self.__deltaSync:
+            # the local world may have diverged from the server
+            self.__world.reconcile(self.__gameState)
+
+        self.__turn()
+
+    def __applyGameActions(self) -> bool:
+        """
+        Applies the actions of the turn that has passed to the world and advances the local game state to the next turn.
+
+        :return: True if the world is up to date, False if the full game state has to be fetched instead,
+            because an action doesn't match the world or the game may finish.
+        """
+        gameState = self.__gameState
+        previousPlayer = gameState["current_player_idx"]
+        # our own actions were applied when they were sent
+        if previousPlayer != self.__playerID:
+            gameActions = self.__session.getGameActions()["actions"]
+            if not self.__world.applyGameActions(gameActions, previousPlayer):
+                logging.debug("Game actions don't match the world, fetching the game state")
+                return False
+
+        # the game state tells if and how the game finished, either on the last turn or by a base capture
+        currentTurn = gameState["current_turn"] + 1
+        if currentTurn >= gameState["num_turns"] or self.__world.isCaptureWithinReach():
+            return False
+
+        playerIds = [player.idx for player in gameState["players"] if not player.isObserver]
+        gameState["current_turn"] = currentTurn
+        gameState["current_player_idx"] = playerIds[(playerIds.index(previousPlayer) + 1) % len(playerIds)]
+        self.__previousPlayer = None
+        self.__turn()
+        self.__round()
+        return True
 
     def __turn(self) -> None:
+        if self.__replayWriter is not None:
+            self.__replayWriter.write(self.__gameState)
         self.__world.addMissingTanks(self.__gameState)
         self.__world.addMissingPlayers(self.__gameState)
         self.__world.turn(self.__gameState)
@@ -67,8 +139,14 @@ class Game:
                 self.__reset()
             else:
                 logging.debug(self.__gameState)
+                self.__logEventStatistics()
                 return
 
+    def __logEventStatistics(self) -> None:
+        eventStatistics = self.__world.getEventStatistics()
+        if eventStatistics is not None:
+            logging.info(f"Event statistics:\n{eventStatistics.getSummary()}")
+
     def __play(self):
         while not self.__gameState["finished"]:
             try:
@@ -81,17 +159,21 @@ class Game:
                     else:
                         self.__otherTurn()
                 else:
+                    # the previous attempt of this turn failed, so the number of turns that passed is unknown
+                    self.__fullSync = True
                     self.__session.nextTurn()
 
-                self.__gameState = self.__session.getGameState()
-                self.__turn()
+                self.__sync()
             except TimeoutException as exception:
                 logging.debug(f"TimeoutException:{exception.message}")
+                self.__fullSync = True
             except (InappropriateGameStateException, InternalServerErrorException) as exception:
                 logging.debug(f"{exception.__class__.__name__}:{exception.message}")
+                self.__fullSync = True
                 self.__reset()
             except BadCommandException as exception:
                 logging.debug(f"BadCommandException:{exception.message}")
+                self.__fullSync = True
                 self.__session.nextTurn()
                 self.__reset()
         print("playerID: " + str(self.__player.getId()))
@@ -0,0 +1,62 @@
+from typing import NamedTuple
+from Aliases import jsonDict, positionTuple
+
+
+class VehicleData(NamedTuple):
+    """
+    The data of a vehicle from the game state.
+    """
+    playerId: int
+    vehicleType: str
+    health: int
+    spawnPosition: positionTuple
+    position: positionTuple
+    capturePoints: int
+    shootRangeBonus: bool
+
+
+class PlayerData(NamedTuple):
+    """
+    The data of a player or an observer from the game state.
+    """
+    idx: int
+    name: str
+    isObserver: bool
+
+
+def shapeMap(mapData: jsonDict) -> jsonDict:
+    """
+    Converts the hexes of the map content into position tuples, in place.
+
+    :param mapData: The decoded map dictionary.
+    :return: The map dictionary, with a tuple of position tuples for every type of map content.
+    """
+    mapData["content"] = {hexType: tuple((hex["x"], hex["y"], hex["z"]) for hex in hexes)
+                          for hexType, hexes in mapData["content"].items()}
+
+    return mapData
+
+
+def shapeGameState(gameState: jsonDict) -> jsonDict:
+    """
+    Converts the vehicles, players and catapult usage of the game state into typed data, in place.
+
+    :param gameState: The decoded game state dictionary.
+    :return: The game state dictionary, with vehicles as a dictionary of VehicleData, players as a tuple of PlayerData
+        and catapult usage as a tuple of position tuples.
+    """
+    vehicles = {}
+    for tankId, tankData in gameState["vehicles"].items():
+        spawnPosition = tankData["spawn_position"]
+        position = tankData["position"]
+        vehicles[tankId] = VehicleData(tankData["player_id"], tankData["vehicle_type"], tankData["health"],
+                                       (spawnPosition["x"], spawnPosition["y"], spawnPosition["z"]),
+                                       (position["x"], position["y"], position["z"]),
+                                       tankData["capture_points"], bool(tankData["shoot_range_bonus"]))
+
+    gameState["vehicles"] = vehicles
+    gameState["players"] = tuple(PlayerData(player["idx"], player["name"], player["is_observer"])
+                                 for player in gameState["players"])
+    gameState["catapult_usage"] = tuple((hex["x"], hex["y"], hex["z"]) for hex in gameState["catapult_usage"])
+
+    return gameState
@@ -2,6 +2,7 @@
 # Corresponding conversions are implemented.
 
 from tkinter import Canvas, Tk
+from HexLayout import HexLayout
 
 
 class HexaCanvas(Canvas):
@@ -15,9 +16,9 @@ class HexaCanvas(Canvas):
     def setHexaSize(self, number):
         self.hexaSize = number
 
-    def create_hexagone(self, x, y, fill="blue", label=""):
+    def create_hexagone(self, x, y, fill="blue", label="", points=None):
         """
-        Compute coordinates of 6 points relative to a center position.
+        Compute coordinates of 6 points relative to a center position, unless they are given.
         Point are numbered following this schema :
 
         Points in euclidean grid:
@@ -28,25 +29,22 @@ class HexaCanvas(Canvas):
 
                   5   4
 
-        Returns an objectID (int) of the created hexagone.
+        Returns the objectIDs (int) of the created hexagone and its label.
         """
-        size = self.hexaSize
-        deltaY = ((3**0.5) / 2) * size
-
-        points = []
-        points.append((x - size / 2, y + deltaY))
-        points.append((x + size / 2, y + deltaY))
-        points.append((x + size, y))
-        points.append((x + size / 2, y - deltaY))
-        points.append((x - size / 2, y - deltaY))
-        points.append((x - size, y))
+        if points is None:
+            size = self.hexaSize
+            deltaY = ((3**0.5) / 2) * size
+
+            points = []
+            points.append((x - size / 2, y + deltaY))
+            points.append((x + size / 2, y + deltaY))
+            points.append((x + size, y))
+            points.append((x + size / 2, y - deltaY))
+            points.append((x - size / 2, y - deltaY))
+            points.append((x - size, y))
 
         polygonId = self.create_polygon(points, fill=fill, width=1, outline="black")
 
-        coords = self.coords(polygonId)
-        centerX = sum(coords[::2]) / len(coords[::2])
-        centerY = sum(coords[1::2]) / len(coords[1::2])
-
         # Add text to the middle of the polygon
         labelId = self.create_text(x, y, text=label, fill='black')
         return polygonId, labelId
@@ -54,12 +52,16 @@ class HexaCanvas(Canvas):
 
 class HexagonalGrid(HexaCanvas):
     """A grid whose each cell is hexagonal.
-    Has one private field - a dict to keep track of all the cells that are drawn as well their objectIDs
+    Each cell's polygon and label are created once. Later changes of a cell are collected and applied to the existing
+    items by flush, so redrawing costs as much as the number of changed cells.
+    Pixel positions of the cells come from a HexLayout, computed once for the board.
     """
 
-    def __init__(self, master, hexaSize, grid_width, grid_height, *args, **kwargs):
-        self.__drawn_cells_dict = {}
-        self.__drawn_labels_dict = {}
+    def __init__(self, master, hexaSize, grid_width, grid_height, *args, layout=None, **kwargs):
+        self.__layout = layout if layout is not None else HexLayout(grid_width, hexaSize)
+        self.__drawn_cells_dict = {}  # dict[(xCell, yCell), (polygonId, labelId)]
+        self.__cell_options_dict = {}  # dict[(xCell, yCell), (fill, label)] as drawn
+        self.__dirty_cells_dict = {}  # dict[(xCell, yCell), (fill, label)] waiting for the next flush
         width = grid_width * (hexaSize * 3)
         height = (3**0.5 * hexaSize) * (grid_height * 2 - 1) + 10
 
@@ -74,66 +76,42 @@ class HexagonalGrid(HexaCanvas):
         )
         self.setHexaSize(hexaSize)
 
-    def setCell(self, xCell, yCell, *args, **kwargs):
-        """Create a content in the cell of coordinates x and y. Could specify options throughout keywords :
-        color, fill, color1, color2, color3, color4; color5, color6.
-
-        Returns an objectID (int) of the created hexagone.
+    def setCell(self, xCell, yCell, fill="white", label=""):
+        """Sets the fill color and the label of the cell of coordinates x and y.
+        A cell that isn't drawn yet is created right away, changes of drawn cells are applied by the next flush.
         """
+        cell = (xCell, yCell)
+        if cell not in self.__drawn_cells_dict:
+            pix_x, pix_y = self.__layout.getCenter(cell)
+            self.__drawn_cells_dict[cell] = self.create_hexagone(pix_x, pix_y, fill=fill, label=label,
+                                                                 points=self.__layout.getVertices(cell))
+            self.__cell_options_dict[cell] = (fill, label)
+            self.__dirty_cells_dict.pop(cell, None)
+        else:
+            self.__dirty_cells_dict[cell] = (fill, label)
 
-        # compute pixel coordinate of the center of the cell:
-        size = self.hexaSize
-        deltaY = ((3**0.5) / 2) * size
-
-        pix_y = deltaY + 2 * deltaY * yCell
-        if xCell % 2 == 1:
-            pix_y += deltaY
-
-        pix_x = size + xCell * 1.5 * size + 5
-        pix_y += 5
-
-        polygonId, labelId = self.create_hexagone(pix_x, pix_y, *args, **kwargs)
-        # Delete the old cell.
-        if (xCell, yCell) in self.__drawn_cells_dict:
-            self.delete(self.__drawn_cells_dict[(xCell, yCell)])
-        if (xCell, yCell) in self.__drawn_labels_dict:
-            self.delete(self.__drawn_labels_dict[(xCell, yCell)])
-        self.__drawn_cells_dict[(xCell, yCell)] = polygonId
-        self.__drawn_labels_dict[(xCell, yCell)] = labelId
-
-    def draw_grid(self, size: int, x: int, y: int):
+    def flush(self):
         """
-        Draws the grid. Uses drawn_cells_dict to keep track of already drawn cells.
-
-        :param size: The size of the grid.
-        :param x: The x coordinate of a given cell.
-        :param y: The y coordinate of a given cell.
+        Applies the changes of the cells since the last flush, reconfiguring only the items that changed.
         """
-        axial_coordinates = offset_to_axial(x, y)
-        distance_from_center = axial_distance(
-            0, 0, axial_coordinates[0], axial_coordinates[1]
-        )
-        if (
-            distance_from_center == size
-            or (x + size - 1, y + size - 1) in self.__drawn_cells_dict
-        ):
-            return
-
-        self.setCell(x + size - 1, y + size - 1, fill="white", label="")
-
-        self.draw_grid(size, x, y - 1)  # up
-        if x & 1 == 0:
-            self.draw_grid(size, x + 1, y - 1)  # up right
-            self.draw_grid(size, x + 1, y)  # down right
-            self.draw_grid(size, x, y + 1)  # down
-            self.draw_grid(size, x - 1, y)  # down left
-            self.draw_grid(size, x - 1, y - 1)  # up left
-        else:
-            self.draw_grid(size, x + 1, y)  # up right
-            self.draw_grid(size, x + 1, y + 1)  # down right
-            self.draw_grid(size, x, y + 1)  # down
-            self.draw_grid(size, x - 1, y + 1)  # down left
-            self.draw_grid(size, x, y - 1)  # up left
+        for cell, (fill, label) in self.__dirty_cells_dict.items():
+            drawnFill, drawnLabel = self.__cell_options_dict[cell]
+            polygonId, labelId = self.__drawn_cells_dict[cell]
+            if fill != drawnFill:
+                self.itemconfigure(polygonId, fill=fill)
+            if label != drawnLabel:
+                self.itemconfigure(labelId, text=label)
+            self.__cell_options_dict[cell] = (fill, label)
+
+        self.__dirty_cells_dict.clear()
+
+    def draw_grid(self):
+        """
+        Draws every cell of the layout that isn't drawn yet as an empty cell.
+        """
+        for xCell, yCell in self.__layout.getCells():
+            if (xCell, yCell) not in self.__drawn_cells_dict:
+                self.setCell(xCell, yCell, fill="white", label="")
 
 
 def axial_distance(aq: int, ar: int, bq: int, br: int):
@@ -186,6 +164,6 @@ if __name__ == "__main__":
     grid = HexagonalGrid(tk, hexaSize=20, grid_width=board_size, grid_height=board_size)
     grid.grid(row=0, column=0, padx=5, pady=5)
 
-    grid.draw_grid(board_size, 0, 0)
+    grid.draw_grid()
 
     tk.mainloop()
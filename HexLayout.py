@@ -0,0 +1,83 @@
+from Aliases import positionTuple
+
+cellTuple = tuple[int, int]  # offset coordinates of a cell on the drawn grid
+
+
+class HexLayout:
+    """
+    The pixel layout of a hexagonal board, drawn in offset coordinates.
+
+    The cells of the board are enumerated once, and the pixel centers and polygon vertices of every cell are computed
+    up front, so drawing a cell is a lookup.
+    """
+
+    def __init__(self, size: int, hexaSize: int, margin: int = 5) -> None:
+        """
+        Lays out a board.
+
+        :param size: The size of the board, the number of cells from the center to the edge including the center.
+        :param hexaSize: The distance between the center and the corners of a cell in pixels.
+        :param margin: (Optional) The distance between the edge of the canvas and the board in pixels.
+        """
+        self.__size = size
+        radius = size - 1
+        deltaY = ((3 ** 0.5) / 2) * hexaSize
+
+        self.__cells = []
+        self.__centers = {}
+        self.__vertices = {}
+
+        for q in range(-radius, radius + 1):
+            for r in range(max(-radius, -q - radius), min(radius, radius - q) + 1):
+                cell = self.getCell((q, r, -q - r))
+                xCell, yCell = cell
+
+                x = hexaSize + xCell * 1.5 * hexaSize + margin
+                y = deltaY + 2 * deltaY * yCell
+                if xCell % 2 == 1:
+                    y += deltaY
+                y += margin
+
+                self.__cells.append(cell)
+                self.__centers[cell] = (x, y)
+                self.__vertices[cell] = (x - hexaSize / 2, y + deltaY, x + hexaSize / 2, y + deltaY,
+                                         x + hexaSize, y, x + hexaSize / 2, y - deltaY,
+                                         x - hexaSize / 2, y - deltaY, x - hexaSize, y)
+
+        self.__cells = tuple(self.__cells)
+
+    def getCell(self, position: positionTuple) -> cellTuple:
+        """
+        Converts a position in cube coordinates into the cell on the grid.
+
+        :param position: A tuple representing the position on the board.
+        :return: The offset coordinates of the cell, counted from the top left corner of the grid.
+        """
+        q, r = position[0], position[1]
+        return q + self.__size - 1, r + (q - (q & 1)) // 2 + self.__size - 1
+
+    def getCells(self) -> tuple[cellTuple, ...]:
+        """
+        Returns all the cells of the board.
+
+        :return: A tuple of cells in offset coordinates.
+        """
+        return self.__cells
+
+    def getCenter(self, cell: cellTuple) -> tuple[float, float]:
+        """
+        Returns the pixel coordinates of the center of a cell.
+
+        :param cell: The offset coordinates of the cell.
+        :return: A tuple of the x and y pixel coordinates.
+        """
+        return self.__centers[cell]
+
+    def getVertices(self, cell: cellTuple) -> tuple[float, ...]:
+        """
+        Returns the pixel coordinates of the corners of a cell, in the order they are drawn.
+
+        :param cell: The offset coordinates of the cell.
+        :return: A flat tuple of x and y pixel coordinates of the six corners.
+        """
+        return self.__vertices[cell]
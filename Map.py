@@ -1,7 +1,20 @@
+from array import array
 from Aliases import jsonDict
 from Aliases import positionTuple
-from Utils import hexToTuple
-from Constants import HexTypes
+from Constants import HexTypes, HexFlags, HEX_DIRECTIONS
+
+
+def boardPositions(size: int) -> tuple[positionTuple, ...]:
+    '''
+    Enumerates the positions of a map of the given size, in the order of their hex ids.
+
+    :param size: The size of the map.
+    :return: A tuple of position tuples.
+    '''
+    radius = size - 1
+    return tuple((x, y, -x - y) for x in range(-radius, radius + 1)
+                 for y in range(max(-radius, -x - radius), min(radius, radius - x) + 1))
+
 
 class Map:
     def __init__(self, mapData: jsonDict) -> None:
@@ -14,27 +27,71 @@ class Map:
         self.__name = mapData["name"]
         self.__map = {}
         self.__initializeMapContent(mapData["content"])
+        self.__initializeHexIndex()
+        self.__initializeTerrain()
 
     def __initializeMapContent(self, mapContent: jsonDict) -> None:
         '''
         Initializes the map content.
 
-        :param base: A dictionary containing the map content for the map.
+        :param mapContent: A dictionary containing the positions of every type of map content (see GameData.shapeMap).
         '''
-        for baseHex in mapContent["base"]:
-            self.__map[hexToTuple(baseHex)] = HexTypes.BASE.value
+        for basePosition in mapContent["base"]:
+            self.__map[basePosition] = HexTypes.BASE.value
 
-        for obstacleHex in mapContent["obstacle"]:
-            self.__map[hexToTuple(obstacleHex)] = HexTypes.OBSTACLE.value
+        for obstaclePosition in mapContent["obstacle"]:
+            self.__map[obstaclePosition] = HexTypes.OBSTACLE.value
 
-        for catapultHex in mapContent["catapult"]:
-            self.__map[hexToTuple(catapultHex)] = HexTypes.CATAPULT.value
+        for catapultPosition in mapContent["catapult"]:
+            self.__map[catapultPosition] = HexTypes.CATAPULT.value
 
-        for lightRepairHex in mapContent["light_repair"]:
-            self.__map[hexToTuple(lightRepairHex)] = HexTypes.LIGHT_REPAIR.value
+        for lightRepairPosition in mapContent["light_repair"]:
+            self.__map[lightRepairPosition] = HexTypes.LIGHT_REPAIR.value
 
-        for hardRepairHex in mapContent["hard_repair"]:
-            self.__map[hexToTuple(hardRepairHex)] = HexTypes.HARD_REPAIR.value
+        for hardRepairPosition in mapContent["hard_repair"]:
+            self.__map[hardRepairPosition] = HexTypes.HARD_REPAIR.value
+
+    def __initializeHexIndex(self) -> None:
+        '''
+        Builds a dense index of all hexes on the map.
+
+        Every hex gets an integer id. Neighbours and distances between every pair of hexes are computed once
+        here, so the systems can look them up instead of recomputing them.
+        '''
+        self.__positions = boardPositions(self.__size)
+        self.__cellIds = {position: cellId for cellId, position in enumerate(self.__positions)}
+
+        adjacency = []
+        neighbourPositions = {}
+        for position in self.__positions:
+            neighbours = [tuple(x + y for x, y in zip(position, direction)) for direction in HEX_DIRECTIONS]
+            neighbours = tuple(neighbour for neighbour in neighbours if neighbour in self.__cellIds)
+            adjacency.append(tuple(self.__cellIds[neighbour] for neighbour in neighbours))
+            neighbourPositions[position] = neighbours
+
+        self.__adjacency = tuple(adjacency)
+        self.__neighbourPositions = neighbourPositions
+
+        # distances are never bigger than the map diameter, so every row fits in an unsigned short array
+        self.__distances = tuple(
+            array("H", [(abs(x1 - x2) + abs(y1 - y2) + abs(z1 - z2)) // 2 for x2, y2, z2 in self.__positions])
+            for x1, y1, z1 in self.__positions)
+
+    def __initializeTerrain(self) -> None:
+        '''
+        Builds the terrain grid, holding the terrain flags of every hex indexed by hex id.
+        '''
+        openHex = HexFlags.PASSABLE | HexFlags.SHOOT_THROUGH
+        flagsByType = {
+            HexTypes.EMPTY.value: openHex,
+            HexTypes.BASE.value: openHex | HexFlags.BASE,
+            HexTypes.OBSTACLE.value: HexFlags.NONE,
+            HexTypes.CATAPULT.value: openHex | HexFlags.CATAPULT,
+            HexTypes.LIGHT_REPAIR.value: openHex | HexFlags.LIGHT_REPAIR,
+            HexTypes.HARD_REPAIR.value: openHex | HexFlags.HARD_REPAIR,
+        }
+
+        self.__terrain = bytearray(flagsByType[self.objectAt(position)] for position in self.__positions)
 
     def getSize(self) -> int:
         '''
@@ -63,6 +120,105 @@ class Map:
         '''
         return self.__map.get(position, "Empty")
 
+    def getCellCount(self) -> int:
+        '''
+        Returns the number of hexes on the map.
+
+        :return: An integer representing the number of hexes on the map.
+        '''
+        return len(self.__positions)
+
+    def getCellId(self, position: positionTuple) -> int | None:
+        '''
+        Returns the id of the hex at the given position.
+
+        :param position: A tuple representing the position to look up.
+        :return: The integer id of the hex or None if the position is outside of the map.
+        '''
+        return self.__cellIds.get(position)
+
+    def getPosition(self, cellId: int) -> positionTuple:
+        '''
+        Returns the position of the hex with the given id.
+
+        :param cellId: The id of the hex.
+        :return: A tuple representing the position of the hex.
+        '''
+        return self.__positions[cellId]
+
+    def getPositions(self) -> tuple[positionTuple, ...]:
+        '''
+        Returns the positions of all hexes on the map, indexed by hex id.
+
+        :return: A tuple of position tuples.
+        '''
+        return self.__positions
+
+    def getAdjacency(self) -> tuple[tuple[int, ...], ...]:
+        '''
+        Returns the neighbour ids of all hexes on the map, indexed by hex id.
+
+        :return: A tuple containing a tuple of neighbour ids for every hex.
+        '''
+        return self.__adjacency
+
+    def getNeighbours(self, position: positionTuple) -> tuple[positionTuple, ...]:
+        '''
+        Returns the positions of the neighbouring hexes that are on the map.
+
+        :param position: A tuple representing the position to look up.
+        :return: A tuple of neighbouring position tuples.
+        '''
+        return self.__neighbourPositions.get(position, ())
+
+    def getDistance(self, position1: positionTuple, position2: positionTuple) -> int:
+        '''
+        Returns the distance between two positions.
+
+        :param position1: The first position.
+        :param position2: The second position.
+        :return: The distance between the two positions.
+        '''
+        cellId1 = self.__cellIds.get(position1)
+        cellId2 = self.__cellIds.get(position2)
+
+        if cellId1 is None or cellId2 is None:
+            return (abs(position1[0] - position2[0]) + abs(position1[1] - position2[1]) + abs(
+                position1[2] - position2[2])) // 2
+
+        return self.__distances[cellId1][cellId2]
+
+    def getDistances(self, cellId: int) -> array:
+        '''
+        Returns the distances from the hex with the given id to every hex on the map.
+
+        :param cellId: The id of the hex.
+        :return: An array of distances, indexed by hex id.
+        '''
+        return self.__distances[cellId]
+
+    def getTerrain(self) -> bytearray:
+        '''
+        Returns the terrain flags of all hexes on the map, indexed by hex id.
+
+        :return: A bytearray of HexFlags values.
+        '''
+        return self.__terrain
+
+    def flagsAt(self, position: positionTuple) -> int:
+        '''
+        Returns the terrain flags of the hex at the given position.
+
+        :param position: A tuple representing the position to look up.
+        :return: An integer of HexFlags values. Positions outside of the map have no flags set.
+        '''
+        cellId = self.__cellIds.get(position)
+
+        if cellId is None:
+            return HexFlags.NONE.value
+
+        return self.__terrain[cellId]
+
     def __iter__(self):
         """
         Returns an iterator over the positions and objects in the Map.
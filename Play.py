@@ -20,15 +20,25 @@ def validatePositive(ctx, param, value):
 @click.option("--fullgame", is_flag=True)
 @click.option("--observer", is_flag=True)
 @click.option("--wait", is_flag=True)
-def play(name, password, gamename, numturns, numplayers, fullgame, observer, wait):
+@click.option("--timebudget", type=float, default=None, callback=validatePositive)
+@click.option("--workers", type=int, default=0)
+@click.option("--eventstats", is_flag=True)
+@click.option("--deltasync", is_flag=True)
+@click.option("--headless", is_flag=True)
+@click.option("--replay", type=click.Path(dir_okay=False, writable=True), default=None)
+def play(name, password, gamename, numturns, numplayers, fullgame, observer, wait, timebudget, workers, eventstats,
+         deltasync, headless, replay):
     data = {"game": gamename, "num_turns": numturns, "num_players": numplayers, "is_full": fullgame,
             "is_observer": observer}
 
+    if eventstats:
+        logging.getLogger().setLevel(logging.INFO)
+
     click.echo("Playing...")
 
     with PlayerSession(name, password) as playerSession:
         try:
-            game = Game(playerSession, data)
+            game = Game(playerSession, data, timebudget, workers, eventstats, deltasync, headless, replay)
         except AccessDeniedException as exception:
             click.echo(f"Access denied: {exception.message}")
             return None
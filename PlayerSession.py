@@ -1,21 +1,54 @@
 from ServerConnection import ServerConnection
 from Aliases import jsonDict
 from Exceptions import BadCommandException, AccessDeniedException, InappropriateGameStateException, TimeoutException, InternalServerErrorException
+from Exceptions import ServerException
 from Constants import Result
 
+errorMapping = {
+    Result.BAD_COMMAND.value: BadCommandException,
+    Result.ACCESS_DENIED.value: AccessDeniedException,
+    Result.INAPPROPRIATE_GAME_STATE.value: InappropriateGameStateException,
+    Result.TIMEOUT.value: TimeoutException,
+    Result.INTERNAL_SERVER_ERROR.value: InternalServerErrorException
+}
+
+
+def handleResult(result):
+    """
+    Handles error codes and returns data if request was successful
+    :param result: result dict from action request with "resultCode" and "data" keys
+    :return: result["data"] if the result was okay,
+    Exception is raised for error types.
+    """
+    code = result["resultCode"]
+    if code != Result.OKAY:
+        raise errorMapping[code](result["data"]["error_message"])
+
+    return result["data"]
+
+
+def handleResults(results):
+    """
+    Handles the results of pipelined requests separately, so that one failed request doesn't hide the others.
+    :param results: list of result dicts from action requests
+    :return: list with result["data"] of the okay results and the exception of the others
+    """
+    handled = []
+    for result in results:
+        try:
+            handled.append(handleResult(result))
+        except ServerException as exception:
+            handled.append(exception)
+
+    return handled
+
+
 class PlayerSession:
-    __slots__ = ("name", "password", "connection", "__errorMapping")  # class members
+    __slots__ = ("name", "password", "connection")  # class members
 
     def __init__(self, name, password):
         self.name = name
         self.password = password
-        self.__errorMapping = {
-            Result.BAD_COMMAND.value: BadCommandException,
-            Result.ACCESS_DENIED.value: AccessDeniedException,
-            Result.INAPPROPRIATE_GAME_STATE.value: InappropriateGameStateException,
-            Result.TIMEOUT.value: TimeoutException,
-            Result.INTERNAL_SERVER_ERROR.value: InternalServerErrorException
-        }
 
     def __enter__(self):
         self.connection = ServerConnection()
@@ -28,11 +61,7 @@ class PlayerSession:
         :return: result["data"] if the result was okay,
         Exception is raised for error types.
         """
-        code = result["resultCode"]
-        if code != Result.OKAY:
-            raise self.__errorMapping[code](result["data"]["error_message"])
-
-        return result["data"]
+        return handleResult(result)
 
     def login(self, data: jsonDict) -> int:
         """
@@ -119,6 +148,14 @@ class PlayerSession:
         """
         return self.__handleResult(self.connection.shoot(data))
 
+    def pipeline(self, requests: list[tuple[int, jsonDict]]) -> list:
+        """
+        Sends several requests without waiting for each response, e.g. all the actions of a turn followed by TURN.
+        :param requests: list of tuples of the action code and the request data (or None)
+        :return: list with the data of each successful request and the exception of each failed one, in order
+        """
+        return handleResults(self.connection.pipeline(requests))
+
     def __exit__(self, *args):
         """
         Close connection to the server socket on exit
@@ -0,0 +1,337 @@
+import lzma
+import struct
+from typing import Iterator
+from Aliases import jsonDict
+from GameData import VehicleData, PlayerData
+from Map import boardPositions
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# A replay starts with an uncompressed file header, the rest of the file is compressed.
+# It holds the map followed by a record for every recorded game state. Positions are stored as hex ids.
+fileHeader = struct.Struct("<4sBB")  # magic, version, compression
+mapHeader = struct.Struct("<HHBB")  # map size, number of turns, number of players, number of rounds
+turnHeader = struct.Struct("<HBiBi")  # current turn, current round, current player, finished, winner (-1 for none)
+playerRecord = struct.Struct("<iBB")  # player id, is observer, name length
+vehicleRecord = struct.Struct("<HiBH")  # tank id, player id, vehicle type, spawn hex id
+tankRecord = struct.Struct("<HHBBB")  # tank id, hex id, health, capture points, shoot range bonus
+winPointsRecord = struct.Struct("<iHH")  # player id, capture points, kill points
+attackRecord = struct.Struct("<iB")  # player id, number of attacked players
+count = struct.Struct("<H")
+
+MAGIC = b"TPRP"
+VERSION = 1
+NO_COMPRESSION, LZMA, ZSTD = 0, 1, 2
+
+CONTENT_TYPES = ("base", "obstacle", "catapult", "light_repair", "hard_repair")
+VEHICLE_TYPES = ("spg", "light_tank", "heavy_tank", "medium_tank", "at_spg")
+
+
+class ReplayWriter:
+    """
+    Records a game into a replay file.
+
+    The map is written once, followed by a record per game state with only what changed since the previous one.
+    """
+
+    def __init__(self, path: str, mapData: jsonDict, compression: int | None = None) -> None:
+        """
+        Opens a new replay file.
+
+        :param path: The path of the replay file.
+        :param mapData: The map of the game (see GameData.shapeMap).
+        :param compression: (Optional) NO_COMPRESSION, LZMA or ZSTD. ZSTD needs the zstandard package.
+            By default ZSTD is used if it's installed and LZMA otherwise.
+        """
+        if compression is None:
+            compression = ZSTD if zstandard is not None else LZMA
+
+        self.__cellIds = {position: cellId for cellId, position in enumerate(boardPositions(mapData["size"]))}
+        self.__mapData = mapData
+        self.__file = open(path, "wb")
+        self.__file.write(fileHeader.pack(MAGIC, VERSION, compression))
+        self.__stream = self.__file
+        if compression == LZMA:
+            self.__stream = lzma.LZMAFile(self.__file, "wb")
+        elif compression == ZSTD:
+            self.__stream = zstandard.ZstdCompressor().stream_writer(self.__file, closefd=False)
+
+        self.__mapWritten = False
+        self.__tanks = {}  # dict[tankId, tankRecord fields] as last written
+        self.__catapultUses = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __writeMap(self, gameState: jsonDict) -> None:
+        """
+        Writes the map, along with the settings of the game.
+
+        :param gameState: The first game state of the game.
+        """
+        name = self.__mapData["name"].encode("utf-8")
+        parts = [mapHeader.pack(self.__mapData["size"], gameState["num_turns"], gameState["num_players"],
+                                gameState["num_rounds"]), bytes((len(name),)), name]
+
+        for contentType in CONTENT_TYPES:
+            cellIds = [self.__cellIds[position] for position in self.__mapData["content"].get(contentType, ())]
+            parts.append(count.pack(len(cellIds)))
+            parts.append(struct.pack(f"<{len(cellIds)}H", *cellIds))
+
+        self.__stream.write(b"".join(parts))
+        self.__mapWritten = True
+
+    def write(self, gameState: jsonDict) -> None:
+        """
+        Records a game state.
+
+        :param gameState: The game state (see GameData.shapeGameState).
+        """
+        if not self.__mapWritten:
+            self.__writeMap(gameState)
+
+        winner = gameState.get("winner")
+        parts = [turnHeader.pack(gameState["current_turn"], gameState["current_round"],
+                                 gameState["current_player_idx"], bool(gameState["finished"]),
+                                 -1 if winner is None else winner)]
+
+        players = gameState["players"]
+        parts.append(count.pack(len(players)))
+        for player in players:
+            name = player.name.encode("utf-8")
+            parts.append(playerRecord.pack(player.idx, player.isObserver, len(name)))
+            parts.append(name)
+
+        # vehicles that are gone (e.g. in a new round), the ones that appeared and the ones that changed
+        vehicles = [(int(tankId), tankData) for tankId, tankData in gameState["vehicles"].items()]
+        removedVehicles = set(self.__tanks).difference(tankId for tankId, _ in vehicles)
+        parts.append(count.pack(len(removedVehicles)))
+        for tankId in removedVehicles:
+            parts.append(count.pack(tankId))
+            del self.__tanks[tankId]
+
+        newVehicles = [(tankId, tankData) for tankId, tankData in vehicles if tankId not in self.__tanks]
+        parts.append(count.pack(len(newVehicles)))
+        for tankId, tankData in newVehicles:
+            parts.append(vehicleRecord.pack(tankId, tankData.playerId, VEHICLE_TYPES.index(tankData.vehicleType),
+                                            self.__cellIds[tankData.spawnPosition]))
+
+        changedTanks = []
+        for tankId, tankData in vehicles:
+            tank = (tankId, self.__cellIds[tankData.position], tankData.health, tankData.capturePoints,
+                    tankData.shootRangeBonus)
+            if self.__tanks.get(tankId) != tank:
+                self.__tanks[tankId] = tank
+                changedTanks.append(tankRecord.pack(*tank))
+        parts.append(count.pack(len(changedTanks)))
+        parts.extend(changedTanks)
+
+        winPoints = gameState["win_points"]
+        parts.append(count.pack(len(winPoints)))
+        for playerId, points in winPoints.items():
+            parts.append(winPointsRecord.pack(int(playerId), points["capture"], points["kill"]))
+
+        attackMatrix = gameState["attack_matrix"]
+        parts.append(count.pack(len(attackMatrix)))
+        for playerId, attackedIds in attackMatrix.items():
+            parts.append(attackRecord.pack(int(playerId), len(attackedIds)))
+            parts.append(struct.pack(f"<{len(attackedIds)}i", *attackedIds))
+
+        # catapult usage only grows during a round, a shorter history means a new round has started
+        catapultUsage = gameState["catapult_usage"]
+        if len(catapultUsage) < self.__catapultUses:
+            self.__catapultUses = 0
+        newUses = [self.__cellIds[position] for position in catapultUsage[self.__catapultUses:]]
+        parts.append(count.pack(self.__catapultUses))
+        parts.append(count.pack(len(newUses)))
+        parts.append(struct.pack(f"<{len(newUses)}H", *newUses))
+        self.__catapultUses = len(catapultUsage)
+
+        self.__stream.write(b"".join(parts))
+
+    def close(self) -> None:
+        """
+        Finishes and closes the replay file.
+        """
+        if self.__stream is not self.__file:
+            self.__stream.close()
+        self.__file.close()
+
+
+class ReplayReader:
+    """
+    Reads a replay file, one game state at a time.
+
+    The map and the game states are shaped like the server responses after decoding (see GameData), so they can be
+    passed to World as they are. Iterating over the reader yields the recorded game states in order.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Opens a replay file and reads its map.
+
+        :param path: The path of the replay file.
+        :raises ValueError: If the file isn't a replay or has an unsupported version or compression.
+        """
+        self.__file = open(path, "rb")
+        magic, version, compression = fileHeader.unpack(self.__file.read(fileHeader.size))
+        if magic != MAGIC or version != VERSION:
+            self.__file.close()
+            raise ValueError(f"{path} isn't a version {VERSION} replay")
+
+        self.__stream = self.__file
+        if compression == LZMA:
+            self.__stream = lzma.LZMAFile(self.__file, "rb")
+        elif compression == ZSTD:
+            if zstandard is None:
+                self.__file.close()
+                raise ValueError(f"{path} is compressed with zstd, which needs the zstandard package")
+            self.__stream = zstandard.ZstdDecompressor().stream_reader(self.__file, closefd=False)
+        elif compression != NO_COMPRESSION:
+            self.__file.close()
+            raise ValueError(f"{path} has an unknown compression {compression}")
+
+        self.__readMap()
+        self.__vehicles = {}  # dict[tankId, VehicleData]
+        self.__catapultUsage = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __read(self, size: int) -> bytes:
+        """
+        Reads exactly the given number of bytes.
+
+        :param size: The number of bytes to read.
+        :return: The bytes read, empty if the replay ended.
+        :raises EOFError: If the replay ends in the middle of a record.
+        """
+        data = self.__stream.read(size)
+        while 0 < len(data) < size:
+            chunk = self.__stream.read(size - len(data))
+            if not chunk:
+                break
+            data += chunk
+
+        if 0 < len(data) < size:
+            raise EOFError("The replay ends in the middle of a record")
+
+        return data
+
+    def __unpack(self, record: struct.Struct) -> tuple:
+        return record.unpack(self.__read(record.size))
+
+    def __readCount(self) -> int:
+        return self.__unpack(count)[0]
+
+    def __readCellIds(self) -> tuple[int, ...]:
+        n = self.__readCount()
+        return struct.unpack(f"<{n}H", self.__read(2 * n))
+
+    def __readMap(self) -> None:
+        """
+        Reads the map, along with the settings of the game.
+        """
+        size, self.__numTurns, self.__numPlayers, self.__numRounds = self.__unpack(mapHeader)
+        name = self.__read(self.__read(1)[0]).decode("utf-8")
+        self.__positions = boardPositions(size)
+
+        content = {}
+        for contentType in CONTENT_TYPES:
+            content[contentType] = tuple(self.__positions[cellId] for cellId in self.__readCellIds())
+
+        self.__mapData = {"size": size, "name": name, "content": content}
+
+    def getMap(self) -> jsonDict:
+        """
+        Gets the map of the game.
+
+        :return: A dictionary containing the map data.
+        """
+        return self.__mapData
+
+    def __iter__(self) -> Iterator[jsonDict]:
+        while True:
+            header = self.__read(turnHeader.size)
+            if not header:
+                return
+
+            yield self.__readGameState(header)
+
+    def __readGameState(self, header: bytes) -> jsonDict:
+        """
+        Reads the rest of a game state record and applies it to the previous game state.
+
+        :param header: The turn header of the record.
+        :return: A new game state dictionary.
+        """
+        currentTurn, currentRound, currentPlayer, finished, winner = turnHeader.unpack(header)
+
+        players = []
+        for _ in range(self.__readCount()):
+            idx, isObserver, nameLength = self.__unpack(playerRecord)
+            players.append(PlayerData(idx, self.__read(nameLength).decode("utf-8"), bool(isObserver)))
+
+        for _ in range(self.__readCount()):
+            del self.__vehicles[str(self.__readCount())]
+
+        spawns = {}
+        for _ in range(self.__readCount()):
+            tankId, playerId, vehicleType, spawnCellId = self.__unpack(vehicleRecord)
+            spawns[tankId] = (playerId, VEHICLE_TYPES[vehicleType], self.__positions[spawnCellId])
+
+        for _ in range(self.__readCount()):
+            tankId, cellId, health, capturePoints, shootRangeBonus = self.__unpack(tankRecord)
+            if tankId in spawns:
+                playerId, vehicleType, spawnPosition = spawns[tankId]
+            else:
+                vehicle = self.__vehicles[str(tankId)]
+                playerId, vehicleType, spawnPosition = vehicle.playerId, vehicle.vehicleType, vehicle.spawnPosition
+            self.__vehicles[str(tankId)] = VehicleData(playerId, vehicleType, health, spawnPosition,
+                                                       self.__positions[cellId], capturePoints, bool(shootRangeBonus))
+
+        winPoints = {}
+        for _ in range(self.__readCount()):
+            playerId, capture, kill = self.__unpack(winPointsRecord)
+            winPoints[str(playerId)] = {"capture": capture, "kill": kill}
+
+        attackMatrix = {}
+        for _ in range(self.__readCount()):
+            playerId, n = self.__unpack(attackRecord)
+            attackMatrix[str(playerId)] = list(struct.unpack(f"<{n}i", self.__read(4 * n)))
+
+        del self.__catapultUsage[self.__readCount():]
+        self.__catapultUsage.extend(self.__positions[cellId] for cellId in self.__readCellIds())
+
+        return {
+            "num_players": self.__numPlayers,
+            "num_turns": self.__numTurns,
+            "num_rounds": self.__numRounds,
+            "current_turn": currentTurn,
+            "current_round": currentRound,
+            "current_player_idx": currentPlayer,
+            "finished": bool(finished),
+            "winner": None if winner == -1 else winner,
+            "players": tuple(players),
+            "vehicles": dict(self.__vehicles),
+            "attack_matrix": attackMatrix,
+            "catapult_usage": tuple(self.__catapultUsage),
+            "win_points": winPoints,
+        }
+
+    def close(self) -> None:
+        """
+        Closes the replay file.
+        """
+        if self.__stream is not self.__file:
+            self.__stream.close()
+        self.__file.close()
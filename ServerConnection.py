@@ -1,9 +1,77 @@
 import socket
 import struct
 import json
-from Constants import Action
+from Constants import Action, Result
+from GameData import shapeMap, shapeGameState
 jsonDict = dict[str, any] # alias
 
+header = struct.Struct("<II")  # action or result code, payload length in bytes
+
+# JSON decoders by name, fastest first. Each takes the bytes-like payload.
+decoders = {}
+try:
+    import msgspec
+    decoders["msgspec"] = msgspec.json.Decoder().decode
+except ImportError:
+    pass
+try:
+    import orjson
+    decoders["orjson"] = orjson.loads
+except ImportError:
+    pass
+decoders["json"] = lambda payload: json.loads(bytes(payload))
+
+decode = next(iter(decoders.values()))
+
+# successful responses that are converted into typed data right after decoding
+shapers = {
+    Action.MAP.value: shapeMap,
+    Action.GAME_STATE.value: shapeGameState,
+}
+
+
+def setDecoder(name : str) -> None:
+    '''
+    Selects the JSON decoder used for the responses of all connections.
+
+    :param name: The name of the decoder, one of the keys of decoders.
+
+    :raises KeyError: If the decoder isn't installed.
+    '''
+    global decode
+    decode = decoders[name]
+
+
+def packRequest(actionCode : int, data : jsonDict = None) -> bytes:
+    '''
+    Builds the frame of a request.
+
+    :param actionCode: The code of the action.
+    :param data: The request data dictionary.
+
+    :return: The header followed by the UTF-8 encoded JSON payload.
+    '''
+    payload = json.dumps(data).encode("utf-8") if data else b""
+    return header.pack(actionCode, len(payload)) + payload
+
+
+def parseResponse(resultCode : int, payload, actionCode : int = None) -> jsonDict:
+    '''
+    Builds the response dictionary from a received frame.
+
+    :param resultCode: The result code from the header.
+    :param payload: The bytes-like UTF-8 encoded JSON payload, possibly empty.
+    :param actionCode: (Optional) The code of the requested action. Successful map and game state responses are
+        converted into typed data (see GameData).
+
+    :return: The response of the request.
+    '''
+    data = decode(payload) if len(payload) else ""
+    if resultCode == Result.OKAY.value and actionCode in shapers:
+        data = shapers[actionCode](data)
+
+    return {"resultCode": resultCode, "data": data}
+
 
 class ServerConnection:
     serverAddress = "wgforge-srv.wargaming.net"
@@ -16,6 +84,7 @@ class ServerConnection:
         '''
         self.__Socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.__Socket.connect((self.serverAddress, self.serverPort))
+        self.__buffer = bytearray(64 * 1024)  # receive buffer, grown to fit the largest payload
 
 
 
@@ -28,40 +97,56 @@ class ServerConnection:
 
         :return: The response of the request.
         '''
-        # Convert the data to a JSON string and get its length
-        if data:
-            dataJson = json.dumps(data)
-            dataLen = len(dataJson)
-        else: # No data
-            dataJson = ""
-            dataLen = 0
+        # Send the message to the server
+        self.__Socket.sendall(packRequest(actionCode, data))
 
-        # Construct the message
-        msg = struct.pack("<II", actionCode, dataLen) + dataJson.encode("utf-8")
+        # Receive the response header, then the payload (if there's one)
+        resultCode, dataLen = header.unpack(self.__receive(header.size))
+        return parseResponse(resultCode, self.__receive(dataLen), actionCode)
 
-        # Send the message to the server
-        self.__Socket.sendall(msg)
 
-        # Receive the response from the server
-        response = self.__Socket.recv(8)
+    def pipeline(self, requests : list[tuple[int, jsonDict]]) -> list[jsonDict]:
+        '''
+        Sends several requests back-to-back and then reads their responses, saving a round trip per request.
+
+        The server handles the requests in order, so a request can't depend on the response of an earlier one.
+
+        :param requests: A list of tuples of the action code and the request data dictionary (or None).
 
-        # Unpack the response
-        resultCode, dataLen = struct.unpack("<II", response)
+        :return: The responses of the requests, in the same order.
+        '''
+        self.__Socket.sendall(b"".join(packRequest(actionCode, data) for actionCode, data in requests))
 
-        # Receive the response dictionary (if there's one)
-        data = ""
-        while dataLen > 0:
-            newData = self.__Socket.recv(dataLen) # receive
-            newData = newData.decode("utf-8") # decode
-            dataLen -= len(newData)
-            data += newData
+        responses = []
+        for actionCode, _ in requests:
+            resultCode, dataLen = header.unpack(self.__receive(header.size))
+            responses.append(parseResponse(resultCode, self.__receive(dataLen), actionCode))
 
-        if data:
-            data = json.loads(data) # turn into dictionary
+        return responses
+
+
+    def __receive(self, size : int) -> memoryview:
+        '''
+        Receives exactly the given number of bytes into the receive buffer.
+
+        :param size: The number of bytes to receive.
+
+        :return: A view of the received bytes, valid until the next receive.
+        :raises ConnectionError: If the server closes the connection first.
+        '''
+        if size > len(self.__buffer):
+            self.__buffer = bytearray(size)
+
+        view = memoryview(self.__buffer)[:size]
+        received = 0
+        while received < size:
+            count = self.__Socket.recv_into(view[received:], size - received)
+            if count == 0:
+                raise ConnectionError(f"Connection closed after {received} of {size} bytes")
+            received += count
+
+        return view
 
-        # Return the response as a json dictionary
-        return {"resultCode": resultCode, "data": data}
-    
 
     def login(self, data : jsonDict) -> jsonDict:
         '''
@@ -4,7 +4,7 @@ from Tanks.LIGHT_TANK import LIGHT_TANK
 from Tanks.MEDIUM_TANK import MEDIUM_TANK
 from Tanks.SPG import SPG
 from Tanks.Tank import Tank
-from Aliases import jsonDict
+from GameData import VehicleData
 
 class TankFactory:
     """
@@ -23,13 +23,11 @@ class TankFactory:
             "spg": SPG,
         }
 
-    def createTank(self, tankData: jsonDict) -> Tank:
+    def createTank(self, tankData: VehicleData) -> Tank:
         """
         Creates a tank object from the given tank data.
 
         :param tankData: The data of the tank to create (from the server).
         :return: The newly created Tank object.
         """
-        tankType = tankData["vehicle_type"]
-
-        return self.__tankByType[tankType](tankData)
+        return self.__tankByType[tankData.vehicleType](tankData)
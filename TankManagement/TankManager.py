@@ -2,7 +2,7 @@ from TankManagement.TankFactory import TankFactory
 from Events.Events import TankAddedEvent
 from Events.EventManager import EventManager
 from Tanks.Tank import Tank
-from Aliases import jsonDict
+from GameData import VehicleData
 
 class TankManager:
     """
@@ -18,12 +18,12 @@ class TankManager:
         self.__eventManager = eventManager
         self.__tanks = {}
 
-    def addTank(self, tankId: str, tankData: jsonDict) -> None:
+    def addTank(self, tankId: str, tankData: VehicleData) -> None:
         """
         Adds a new tank to the manager with the given ID and data, and notifies any observers of the new tank.
 
         :param tankId: The ID of the tank to add (from the server).
-        :param tankData: The data of the tank to add, as a dictionary (from the server).
+        :param tankData: The data of the tank to add (from the server).
         """
         self.__tanks[tankId] = self.__tankFactory.createTank(tankData)
         self.__eventManager.triggerEvent(TankAddedEvent, tankId, self.__tanks[tankId])
@@ -37,6 +37,14 @@ class TankManager:
         """
         return tankId in self.__tanks
         
+    def getTankIds(self) -> list[str]:
+        """
+        Gets the IDs of all tanks in the manager.
+
+        :return: A list of tank IDs.
+        """
+        return list(self.__tanks)
+
     def getTank(self, tankId: str) -> Tank:
         """
         Gets the tank entity with the given ID.
@@ -2,7 +2,7 @@ from Events.Events import TankAddedEvent
 from Events.EventManager import EventManager
 from Map import Map
 from Tanks.Tank import Tank
-from Constants import HexTypes
+from Constants import HexFlags, CAPTURE_POINTS_TO_WIN
 
 
 class BaseCaptureSystem:
@@ -46,10 +46,10 @@ class BaseCaptureSystem:
         
         Resets capture points for tanks that aren't in base hex.
         """
-        for tankData in self.__tanks.values():
-            obj = self.__map.objectAt(tankData["position"].position)
+        base = HexFlags.BASE.value
 
-            if obj != HexTypes.BASE.value:
+        for tankData in self.__tanks.values():
+            if not self.__map.flagsAt(tankData["position"].position) & base:
                 tankData["capture"].capturePoints = 0
 
     def __getCapturingTanks(self) -> tuple[set[int], list[str]]:
@@ -63,11 +63,10 @@ class BaseCaptureSystem:
         """
         ownerIds = set()
         capturingTanks = []
+        base = HexFlags.BASE.value
 
         for tankId, tankData in self.__tanks.items():
-            obj = self.__map.objectAt(tankData["position"].position)
-
-            if obj == HexTypes.BASE.value:
+            if self.__map.flagsAt(tankData["position"].position) & base:
                 capturingTanks.append(tankId)
                 ownerIds.add(tankData["owner"])
 
@@ -86,6 +85,25 @@ class BaseCaptureSystem:
             for capturingTank in capturingTanks:
                 self.__tanks[capturingTank]["capture"].capturePoints += 1
 
+    def isCaptureWithinReach(self) -> bool:
+        """
+        Checks if a player may win by capturing the base at the end of the current round.
+
+        Every tank in the base is counted as if it gained a capture point, so the check errs on the side of reaching
+        the capture.
+
+        :return: True if the capture points of a player could reach the amount needed to win, False otherwise.
+        """
+        capturePoints = {}
+        base = HexFlags.BASE.value
+
+        for tankData in self.__tanks.values():
+            if self.__map.flagsAt(tankData["position"].position) & base:
+                owner = tankData["owner"]
+                capturePoints[owner] = capturePoints.get(owner, 0) + tankData["capture"].capturePoints + 1
+
+        return any(points >= CAPTURE_POINTS_TO_WIN for points in capturePoints.values())
+
     def reset(self) -> None:
         """
         Resets the system to it's initial state.
@@ -2,109 +2,101 @@ from Events.Events import TankAddedEvent
 from Events.EventManager import EventManager
 from Map import Map
 from Tanks.Tank import Tank
-from HexGrid import Tk, HexagonalGrid, cube_to_offset
-from threading import Thread
-from queue import Queue
+from HexGrid import Tk, HexagonalGrid
+from HexLayout import HexLayout
+from FrameBuffer import FrameBuffer, COLORS, LABELS
+from multiprocessing import Process
 from Constants import HexTypes, TankTypes
-import time
-import copy
 
 
-def runDisplay(map: Map, messageQueue: Queue) -> None:
-    display = Display(map, messageQueue)
-    display.run()
+def runDisplay(map: Map, frameBufferName: str) -> None:
+    """
+    Runs the display until it's told to stop. The entry point of the display process.
+
+    :param map: The map to display.
+    :param frameBufferName: The name of the frame buffer the display reads the board from.
+    """
+    frameBuffer = FrameBuffer(map.getCellCount(), frameBufferName)
+    try:
+        display = Display(map, frameBuffer)
+        display.run()
+    finally:
+        frameBuffer.close()
 
 
 class Display:
-    def __init__(self, map: Map, messageQueue: Queue) -> None:
+    def __init__(self, map: Map, frameBuffer: FrameBuffer) -> None:
         """
-        Initializes a display for the given map, with the ability to receive update messages through a queue.
+        Initializes a display for the given map, which draws the frames written to the frame buffer.
 
         :param map: The map to display.
-        :param messageQueue: A queue used to receive update messages.
+        :param frameBuffer: The frame buffer to read the frames from.
         """
-        self.__updateRate = 1 / 60
-        self.__messageQueue = messageQueue
+        self.__updateInterval = 16  # milliseconds between checks for a new frame
+        self.__frameBuffer = frameBuffer
+        self.__sequence = 0  # sequence number of the drawn frame
         self.__window = Tk()
         self.__map = map
         self.__window.title(map.getName() + " on HexTanks")
         self.__size = map.getSize()
-        self.__colors = {
-            HexTypes.BASE.value: "green",
-            HexTypes.OBSTACLE.value: "grey0",
-            HexTypes.CATAPULT.value: "red",
-            HexTypes.LIGHT_REPAIR.value: "HotPink3",
-            HexTypes.HARD_REPAIR.value: "HotPink4",
-        }
 
-        self.__labels = {
-            HexTypes.CATAPULT.value: "CP",
-            HexTypes.LIGHT_REPAIR.value: "LR",
-            HexTypes.HARD_REPAIR.value: "HR",
-        }
-
-        self.__grid = HexagonalGrid(self.__window, hexaSize=20, grid_width=self.__size, grid_height=self.__size)
+        layout = HexLayout(self.__size, 20)
+        self.__cells = tuple(layout.getCell(position) for position in map.getPositions())  # grid cells by hex id
+        self.__grid = HexagonalGrid(self.__window, hexaSize=20, grid_width=self.__size, grid_height=self.__size,
+                                    layout=layout)
         self.__grid.grid(row=0, column=0, padx=5, pady=5)
 
-        self.__grid.draw_grid(self.__size, 0, 0)
-        self.__initializeMapContent()
+        self.__grid.draw_grid()
+
+        # codes of the drawn hexes, nothing but the empty grid is drawn yet
+        self.__colors = bytearray(map.getCellCount())
+        self.__labels = bytearray(map.getCellCount())
 
-    def __initializeMapContent(self) -> None:
+    def run(self) -> None:
         """
-        Draws static map objects.
+        Starts the display and draws new frames until the frame buffer tells it to stop.
         """
-        for position, obj in self.__map:
-            self.__setCell(position, self.__colors.get(obj, "white"), self.__labels.get(obj, ""))
+        self.__window.after(0, self.__update)
+        self.__window.mainloop()
 
-    def run(self):
+    def __update(self) -> None:
         """
-        Starts the display and runs an infinite loop to receive and handle messages.
+        Draws the hexes that changed since the last frame, then schedules the next update.
         """
-        while True:
-            while True:
-                try:
-                    messageType, args = self.__messageQueue.get(block=False)
+        if self.__frameBuffer.isStopped():
+            self.__window.destroy()
+            return
 
-                    if messageType == "update":
-                        for update in args[0]:
-                            self.__emptyCell(*update)
+        frame = self.__frameBuffer.read(self.__sequence)
+        if frame is not None:
+            self.__sequence, colors, labels = frame
+            for cellId, (color, label) in enumerate(zip(colors, labels)):
+                if color != self.__colors[cellId] or label != self.__labels[cellId]:
+                    self.__setCell(cellId, COLORS[color], LABELS[label])
 
-                        for update in args[1]:
-                            self.__setCell(*update)
-                    elif messageType == "stop":
-                        self.__window.quit()
-                        return
-                except:
-                    break
+            self.__colors[:] = colors
+            self.__labels[:] = labels
+            self.__grid.flush()
 
-            self.__window.update_idletasks()
-            self.__window.update()
-            time.sleep(self.__updateRate)
+        self.__window.after(self.__updateInterval, self.__update)
 
-    def __setCell(self, position: tuple, fillColor: str, label: str = "") -> None:
+    def __setCell(self, cellId: int, fillColor: str, label: str = "") -> None:
         """
-        Sets the color of the cell at the given position on the map.
+        Sets the color of the hex with the given id.
 
-        :param position: The position of the cell to change.
-        :param fillColor: The color to fill the cell with.
+        :param cellId: The id of the hex to change.
+        :param fillColor: The color to fill the hex with.
+        :param label: (Optional) The label of the hex.
         """
-        offsetCoordinates = cube_to_offset(position[0], position[1])
-        self.__grid.setCell(offsetCoordinates[0] + self.__size - 1, offsetCoordinates[1] + self.__size - 1,
-                            fill=fillColor, label=label)
-
-    def __emptyCell(self, position: tuple) -> None:
-        """
-        Sets the color of the cell at the given position on the map to the default color.
-
-        :param position: The position of the cell to change.
-        """
-        objectType: str = self.__map.objectAt(position)
-        self.__setCell(position, self.__colors.get(objectType, "white"), self.__labels.get(objectType, ""))
+        self.__grid.setCell(*self.__cells[cellId], fill=fillColor, label=label)
 
 
 class DisplaySystem:
     """
     A system that manages the display.
+
+    The display runs in its own process. Every turn the system writes the board into a frame buffer in shared memory,
+    which the display process reads.
     """
 
     def __init__(self, map: Map, eventManager: EventManager) -> None:
@@ -116,20 +108,52 @@ class DisplaySystem:
         """
         self.__eventManager = eventManager
         self.__eventManager.addHandler(TankAddedEvent, self.onTankAdded)
-        self.__teamColors = ["orange", "purple", "blue"]
+        self.__map = map
+        self.__teamColors = [COLORS.index("orange"), COLORS.index("purple"), COLORS.index("blue")]
         self.__OwnerColors = {}
-        self.__tanks = {}
-        self.__turnQueue = [[], []]
-        self.__messageQueue = Queue()
-        self.__displayThread = Thread(target=runDisplay, args=(map, self.__messageQueue))
-        self.__displayThread.start()
+        self.__tanks = {}  # dict[tankId, (positionComponent, ownerId, labelCode)]
         self.__tankLabels = {
-            TankTypes.AT_SPG.value: "TD",
-            TankTypes.HEAVY_TANK.value: "HT",
-            TankTypes.LIGHT_TANK.value: "LT",
-            TankTypes.MEDIUM_TANK.value: "MT",
-            TankTypes.SPG.value: "SPG",
+            TankTypes.AT_SPG.value: LABELS.index("TD"),
+            TankTypes.HEAVY_TANK.value: LABELS.index("HT"),
+            TankTypes.LIGHT_TANK.value: LABELS.index("LT"),
+            TankTypes.MEDIUM_TANK.value: LABELS.index("MT"),
+            TankTypes.SPG.value: LABELS.index("SPG"),
         }
+        self.__initializeTerrain()
+
+        self.__frameBuffer = FrameBuffer(map.getCellCount())
+        self.__frameBuffer.write(self.__terrainColors, self.__terrainLabels)
+        self.__displayProcess = Process(target=runDisplay, args=(map, self.__frameBuffer.getName()), daemon=True)
+        self.__displayProcess.start()
+
+    def __initializeTerrain(self) -> None:
+        """
+        Builds the color and label codes of the hexes without tanks, indexed by hex id.
+        """
+        colors = {
+            HexTypes.BASE.value: COLORS.index("green"),
+            HexTypes.OBSTACLE.value: COLORS.index("grey0"),
+            HexTypes.CATAPULT.value: COLORS.index("red"),
+            HexTypes.LIGHT_REPAIR.value: COLORS.index("HotPink3"),
+            HexTypes.HARD_REPAIR.value: COLORS.index("HotPink4"),
+        }
+
+        labels = {
+            HexTypes.CATAPULT.value: LABELS.index("CP"),
+            HexTypes.LIGHT_REPAIR.value: LABELS.index("LR"),
+            HexTypes.HARD_REPAIR.value: LABELS.index("HR"),
+        }
+
+        objects = [self.__map.objectAt(position) for position in self.__map.getPositions()]
+        self.__terrainColors = bytes(colors.get(obj, COLORS.index("white")) for obj in objects)
+        self.__terrainLabels = bytes(labels.get(obj, LABELS.index("")) for obj in objects)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # copies of the system, like the ones used by the bot's worker processes, don't drive the display
+        state["_DisplaySystem__frameBuffer"] = None
+        state["_DisplaySystem__displayProcess"] = None
+        return state
 
     def onTankAdded(self, tankId: str, tankEntity: Tank) -> None:
         """
@@ -143,58 +167,45 @@ class DisplaySystem:
         ownerComponent = tankEntity.getComponent("owner")
 
         if healthComponent and positionComponent and ownerComponent:
-            self.__tanks[tankId] = {
-                "cHealth": healthComponent.currentHealth,
-                "mHealth": healthComponent.maxHealth,
-                "healthComponent": healthComponent,
-                "position": positionComponent.position,
-                "positionComponent": positionComponent,
-                "ownerId": ownerComponent.ownerId,
-                "tankName": type(tankEntity).__name__
-            }
-            tankColor = self.__OwnerColors.get(ownerComponent.ownerId)
-            tankLabel = self.__tankLabels[type(tankEntity).__name__]
-            if not tankColor:
+            if ownerComponent.ownerId not in self.__OwnerColors:
                 self.__OwnerColors[ownerComponent.ownerId] = self.__teamColors.pop()
-                tankColor = self.__OwnerColors[ownerComponent.ownerId]
-            self.__turnQueue[1].append((positionComponent.position, tankColor, tankLabel))
+            self.__tanks[tankId] = (positionComponent, ownerComponent.ownerId,
+                                    self.__tankLabels[type(tankEntity).__name__])
 
     def turn(self) -> None:
         """
         Performs the turn logic for the system.
 
-        It checks for any changes in tank position and updates the display accordingly. 
-        It then puts the updated display data into a message queue for processing by the display thread.
+        Writes the board with the tanks at their current positions into the frame buffer.
         """
-        for tankData in self.__tanks.values():
-            positionComponent = tankData["positionComponent"]
-            currentPosition = tankData["position"]
-            newPosition = positionComponent.position
-            if newPosition != currentPosition:
-                self.__turnQueue[0].append((currentPosition,))
-                self.__turnQueue[1].append((newPosition, self.__OwnerColors[tankData["ownerId"]],
-                                            self.__tankLabels[tankData["tankName"]]))
-                tankData["position"] = newPosition
+        if self.__frameBuffer is None:
+            return
 
-        self.__messageQueue.put(("update", copy.deepcopy(self.__turnQueue)))
-        self.__turnQueue[0].clear()
-        self.__turnQueue[1].clear()
+        colors = bytearray(self.__terrainColors)
+        labels = bytearray(self.__terrainLabels)
+        for positionComponent, ownerId, label in self.__tanks.values():
+            cellId = self.__map.getCellId(positionComponent.position)
+            colors[cellId] = self.__OwnerColors[ownerId]
+            labels[cellId] = label
+
+        self.__frameBuffer.write(colors, labels)
 
     def quit(self) -> None:
         """
-        Stops the display thread.
+        Stops the display process and frees the frame buffer.
         """
-        self.__messageQueue.put(("stop", []))
-        self.__displayThread.join()
+        if self.__frameBuffer is None:
+            return
+
+        self.__frameBuffer.stop()
+        self.__displayProcess.join()
+        self.__frameBuffer.close()
+        self.__frameBuffer = None
 
     def reset(self) -> None:
         """
         Resets the system to it's initial state.
         """
-        for tankData in self.__tanks.values():
-            self.__turnQueue[0].append((tankData["position"],))
-
-        self.__messageQueue.put(("update", copy.deepcopy(self.__turnQueue)))
-        self.__turnQueue[0].clear()
-        self.__turnQueue[1].clear()
         self.__tanks.clear()
+        if self.__frameBuffer is not None:
+            self.__frameBuffer.write(self.__terrainColors, self.__terrainLabels)
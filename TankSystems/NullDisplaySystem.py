@@ -0,0 +1,21 @@
+class NullDisplaySystem:
+    """
+    A system that stands in for the DisplaySystem in headless games.
+
+    It doesn't handle any events or start a display, so the game doesn't depend on Tk or a screen.
+    """
+
+    def turn(self) -> None:
+        """
+        Performs the turn logic for the system. Does nothing.
+        """
+
+    def quit(self) -> None:
+        """
+        Stops the display. Does nothing.
+        """
+
+    def reset(self) -> None:
+        """
+        Resets the system to it's initial state. Does nothing.
+        """
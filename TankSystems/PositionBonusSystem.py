@@ -7,6 +7,7 @@ from Tanks.Tank import Tank
 from Tanks.AT_SPG import AT_SPG
 from Tanks.HEAVY_TANK import HEAVY_TANK
 from Tanks.MEDIUM_TANK import MEDIUM_TANK
+from Constants import HexFlags
 
 class PositionBonusSystem:
     """
@@ -48,13 +49,17 @@ class PositionBonusSystem:
         
         Checks if each tank is on a bonus tile and triggers the appropriate event.
         """
+        lightRepair = HexFlags.LIGHT_REPAIR.value
+        hardRepair = HexFlags.HARD_REPAIR.value
+        catapult = HexFlags.CATAPULT.value
+
         for tankId, tankData in self.__tanks.items():
-            obj = self.__map.objectAt(tankData["position"].position)
+            flags = self.__map.flagsAt(tankData["position"].position)
             tankType = tankData["tankType"]
 
-            if (obj == "LightRepair" and tankType in self.__lightRepair) or (obj == "HardRepair" and tankType in self.__hardRepair):
+            if (flags & lightRepair and tankType in self.__lightRepair) or (flags & hardRepair and tankType in self.__hardRepair):
                 self.__eventManager.triggerEvent(TankRepairedEvent, tankId)
-            elif obj == "Catapult":
+            elif flags & catapult:
                  self.__eventManager.triggerEvent(TankRangeBonusEvent, tankId)
 
     def reset(self) -> None:
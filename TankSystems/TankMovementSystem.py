@@ -6,8 +6,7 @@ from Map import Map
 from Tanks.Tank import Tank
 from Aliases import positionTuple
 from collections import deque
-from Constants import HexTypes
-import itertools
+from Constants import HexFlags
 
 
 class TankMovementSystem:
@@ -24,15 +23,127 @@ class TankMovementSystem:
         """
         self.__eventManager = eventManager
         self.__eventManager.addHandler(TankAddedEvent, self.onTankAdded)
-        self.__eventManager.addHandler(TankRespawnedEvent, self.onTankRespawned)
-        self.__hexPermutations = list(itertools.permutations([-1, 0, 1], 3))
+        self.__eventManager.addBatchHandler(TankRespawnedEvent, self.onTanksRespawned)
         self.__map = map
-        self.__mapSize = map.getSize()
         self.__tankPositions = {}
         self.__tankMap = {}
         self.__spawnPoints = {}
-        self.__canMoveTo = {HexTypes.EMPTY.value, HexTypes.BASE.value, HexTypes.CATAPULT.value,
-                            HexTypes.LIGHT_REPAIR.value, HexTypes.HARD_REPAIR.value}
+        self.__terrainRegions = {}  # dict[(position, speed), hexes reachable through terrain]
+        self.__reachable = {}  # dict[tankId, current movement options]
+        self.__journal = []  # list[(tankId, previous position, previous movement options)] of moves since a savepoint
+        self.__openSavepoints = 0
+
+    def __getTerrainRegion(self, position: positionTuple, speed: int) -> dict[positionTuple, None]:
+        """
+        Gets all passable positions that can be reached from the given position, ignoring other tanks.
+
+        The map is static, so each region is only searched once.
+
+        :param position: The starting position.
+        :param speed: The maximum movement distance.
+
+        :return: A dictionary with the reachable positions as keys, in breadth-first order.
+        """
+        region = self.__terrainRegions.get((position, speed))
+
+        if region is None:
+            region = self.__findTerrainRegion(position, speed)
+            self.__terrainRegions[(position, speed)] = region
+
+        return region
+
+    def __findTerrainRegion(self, startingPosition: positionTuple, distance: int) -> dict[positionTuple, None]:
+        """
+        Finds all passable positions that can be reached from the given position using breadth-first search.
+
+        :param startingPosition: The starting position.
+        :param distance: The maximum movement distance.
+
+        :return: A dictionary with the reachable positions as keys, in breadth-first order.
+        """
+        positions = self.__map.getPositions()
+        adjacency = self.__map.getAdjacency()
+        terrain = self.__map.getTerrain()
+        passable = HexFlags.PASSABLE.value
+        startingCellId = self.__map.getCellId(startingPosition)
+
+        visited = {startingCellId}  # Set to store visited hex ids
+        result = {}  # Dictionary to store reachable positions
+        queue = deque()
+        queue.append((startingCellId, 0))
+
+        # Perform breadth-first search to find all possible moves
+        while len(queue) > 0:
+            currentCellId, currentDistance = queue.popleft()
+            if not terrain[currentCellId] & passable:
+                continue
+
+            result[positions[currentCellId]] = None
+
+            if currentDistance + 1 > distance:
+                continue
+
+            for neighbourId in adjacency[currentCellId]:
+                if not neighbourId in visited:
+                    visited.add(neighbourId)
+                    queue.append((neighbourId, currentDistance + 1))
+
+        return result
+
+    def __canStopAt(self, tankId: str, position: positionTuple) -> bool:
+        """
+        Checks whether the tank can end its move at the given position.
+
+        :param tankId: The ID of the moving tank.
+        :param position: The position to check.
+
+        :return: True if the position is free and isn't someone else's spawn point, False otherwise.
+        """
+        spawnPoint = self.__spawnPoints.get(position)
+        return not position in self.__tankMap and (spawnPoint is None or spawnPoint == tankId)
+
+    def __updateReachable(self, tankId: str) -> None:
+        """
+        Rebuilds the movement options of a tank from its terrain region.
+
+        :param tankId: The ID of the tank.
+        """
+        positionComponent = self.__tankPositions[tankId]
+        region = self.__getTerrainRegion(positionComponent.position, positionComponent.speed)
+        self.__reachable[tankId] = {position: None for position in region if self.__canStopAt(tankId, position)}
+
+    def __occupy(self, tankId: str, position: positionTuple) -> None:
+        """
+        Marks the position as occupied by the tank and removes it from the movement options of other tanks.
+
+        :param tankId: The ID of the tank occupying the position.
+        :param position: The position being occupied.
+        """
+        self.__tankMap[position] = tankId
+
+        for reachable in self.__reachable.values():
+            reachable.pop(position, None)
+
+    def __vacate(self, tankId: str, position: positionTuple) -> None:
+        """
+        Marks the position as no longer occupied by the tank and adds it back to the movement options
+        of other tanks that can reach it.
+
+        :param tankId: The ID of the tank leaving the position.
+        :param position: The position being left.
+        """
+        if self.__tankMap.get(position) != tankId:
+            return
+
+        self.__tankMap.pop(position)
+
+        for otherTankId, reachable in self.__reachable.items():
+            if otherTankId == tankId or not self.__canStopAt(otherTankId, position):
+                continue
+
+            positionComponent = self.__tankPositions[otherTankId]
+            if position in self.__getTerrainRegion(positionComponent.position, positionComponent.speed):
+                reachable[position] = None
 
     def onTankAdded(self, tankId: str, tankEntity: Tank) -> None:
         """
@@ -45,51 +156,30 @@ class TankMovementSystem:
 
         if positionComponent:
             self.__tankPositions[tankId] = positionComponent
-            self.__tankMap[positionComponent.position] = tankId
             self.__spawnPoints[positionComponent.spawnPosition] = tankId
+            self.__occupy(tankId, positionComponent.position)
+
+            # a new spawn point is forbidden for the other tanks
+            for otherTankId, reachable in self.__reachable.items():
+                if otherTankId != tankId:
+                    reachable.pop(positionComponent.spawnPosition, None)
+
+            self.__updateReachable(tankId)
 
     def getMovementOptions(self, tankId: str) -> list[positionTuple]:
         """
         Gets all possible moves for a given tank.
 
+        Movement options are kept up to date as tanks move, so this is only a lookup.
+
         :param tankId: The ID of the tank to get moves for.
 
         :return: A list of positionTuples representing all possible movement options.
         """
         if tankId not in self.__tankPositions:
             raise ValueError(f"TankId:{tankId} is not in the movement system")
-        
-        # Gets the tanks maximum movement distance
-        distance = self.__tankPositions[tankId].speed
-        startingPosition = self.__tankPositions[tankId].position
-
-        visited = set()  # Set to store visited positions
-        result = []  # List to store valid movement options
-        queue = deque()
-        queue.append(((startingPosition), 0))
-        visited.add(startingPosition)
 
-        # Perform breadth-first search to find all possible moves
-        while len(queue) > 0:
-            currentPosition, currentDistance = queue.popleft()
-            currentPositionObject = self.__map.objectAt(currentPosition)
-            if not (currentPositionObject in self.__canMoveTo):
-                continue
-
-            spawnPoint = self.__spawnPoints.get(currentPosition)
-            if not currentPosition in self.__tankMap and (spawnPoint is None or spawnPoint == tankId):
-                result.append(currentPosition)
-
-            if currentDistance + 1 > distance:
-                continue
-
-            for permutation in self.__hexPermutations:
-                newPosition = tuple(x + y for x, y in zip(currentPosition, permutation))
-                if all(abs(pos) < self.__mapSize for pos in newPosition) and not newPosition in visited:
-                    visited.add(newPosition)
-                    queue.append(((newPosition), currentDistance + 1))
-
-        return result
+        return list(self.__reachable[tankId])
 
     def move(self, tankId: str, newPosition: positionTuple) -> None:
         """
@@ -100,23 +190,80 @@ class TankMovementSystem:
         """
         if tankId not in self.__tankPositions:
             raise ValueError(f"TankId:{tankId} is not in the movement system")
-        
-        self.__tankMap.pop(self.__tankPositions[tankId].position)
-        self.__tankMap[newPosition] = tankId
+
+        if self.__openSavepoints > 0:
+            # the previous movement options are set aside untouched, as they become valid again on rollback
+            self.__journal.append((tankId, self.__tankPositions[tankId].position, self.__reachable.pop(tankId)))
+
+        self.__vacate(tankId, self.__tankPositions[tankId].position)
         self.__tankPositions[tankId].position = newPosition
+        self.__occupy(tankId, newPosition)
+        self.__updateReachable(tankId)
         self.__eventManager.triggerEvent(TankMovedEvent, tankId, newPosition)
 
 
-    def onTankRespawned(self, tankId: str) -> None:
+    def savepoint(self) -> int:
         """
-        Event handler. Handles moving a tank to spawnpoint on respawn.
+        Starts recording moves so that they can be rolled back. Savepoints can be nested.
 
-        :param tankId: The ID of the tank that got respawned.
+        :return: The savepoint, to be passed to rollback or release.
         """
-        positionComponent = self.__tankPositions.get(tankId)
+        self.__openSavepoints += 1
+        return len(self.__journal)
 
-        if positionComponent:
-            self.move(tankId, positionComponent.spawnPosition)
+    def rollback(self, savepoint: int) -> None:
+        """
+        Moves the tanks back to where they were at the savepoint and releases it, triggering a moved event for each move.
+
+        The movement options of the moved tanks are restored as they were instead of being rebuilt.
+
+        :param savepoint: A savepoint returned by savepoint.
+        """
+        while len(self.__journal) > savepoint:
+            tankId, position, reachable = self.__journal.pop()
+            positionComponent = self.__tankPositions[tankId]
+            self.__vacate(tankId, positionComponent.position)
+            positionComponent.position = position
+            self.__occupy(tankId, position)
+            self.__reachable[tankId] = reachable
+            self.__eventManager.triggerEvent(TankMovedEvent, tankId, position)
+
+        self.release(savepoint)
+
+    def release(self, savepoint: int) -> None:
+        """
+        Keeps the moves made since the savepoint and stops recording them once no savepoint is open.
+
+        :param savepoint: A savepoint returned by savepoint.
+        """
+        self.__openSavepoints -= 1
+        if self.__openSavepoints == 0:
+            self.__journal.clear()
+
+    def onTanksRespawned(self, batch: list[tuple[str]]) -> None:
+        """
+        Batch event handler. Handles moving tanks to their spawnpoints on respawn.
+
+        All the tanks leave their positions before any of them is placed,
+        so the movement options of each tank are only rebuilt once.
+
+        :param batch: A list of tuples, each containing the ID of a tank that got respawned.
+        """
+        tankIds = [tankId for tankId in dict.fromkeys(tankId for tankId, in batch) if tankId in self.__tankPositions]
+
+        for tankId in tankIds:
+            self.__vacate(tankId, self.__tankPositions[tankId].position)
+
+        for tankId in tankIds:
+            positionComponent = self.__tankPositions[tankId]
+            positionComponent.position = positionComponent.spawnPosition
+            self.__occupy(tankId, positionComponent.position)
+
+        for tankId in tankIds:
+            self.__updateReachable(tankId)
+
+        for tankId in tankIds:
+            self.__eventManager.triggerEvent(TankMovedEvent, tankId, self.__tankPositions[tankId].position)
 
     def reset(self) -> None:
         """
@@ -124,4 +271,7 @@ class TankMovementSystem:
         """
         self.__tankPositions.clear()
         self.__tankMap.clear()
-        self.__spawnPoints.clear()
\ No newline at end of file
+        self.__spawnPoints.clear()
+        self.__reachable.clear()
+        self.__journal.clear()
+        self.__openSavepoints = 0
\ No newline at end of file
@@ -11,10 +11,9 @@ from Tanks.Components.DirectShootingComponent import DirectShootingComponent
 from Tanks.Components.CurvedShootingComponent import CurvedShootingComponent
 from Tanks.Components.HealthComponent import HealthComponent
 from Aliases import positionTuple, jsonDict, shootingOptionsList
-import itertools
-from Utils import hexToTuple
+from Constants import HexFlags, HEX_DIRECTIONS
+import Tanks.Settings as Settings
 import logging
-from collections import deque
 
 class TankShootingSystem:
     """
@@ -29,7 +28,6 @@ class TankShootingSystem:
         :param eventManager: The EventManager instance to use for triggering events.
         """
         self.__map = map
-        self.__mapSize = self.__map.getSize()
         self.__eventManager = eventManager
         self.__eventManager.addHandler(TankAddedEvent, self.onTankAdded)
         self.__eventManager.addHandler(TankMovedEvent, self.onTankMoved)
@@ -38,13 +36,71 @@ class TankShootingSystem:
         self.__eventManager.addHandler(TankRangeBonusEvent, self.onRangeBonusReceived)
         self.__tanks = {}
         self.__tankMap = {}
-        self.__canShootTrough = {"Empty", "Base", "Catapult", "LightRepair", "HardRepair"}
-        self.__hexPermutations = list(itertools.permutations([-1, 0, 1], 3))
+        self.__directionIndices = {direction: index for index, direction in enumerate(HEX_DIRECTIONS)}
+        self.__curvedMasks = {}  # dict[(minAttackRange, maxAttackRange), offsets in range]
+        self.__shootablePositions = {}  # dict[(position, range), shootable positions]
+        self.__initializeShotPatterns()
+        self.__initializeLinesOfFire()
         self.__initializeAttackMatrix(attackMatrix)
         self.__catapultUsage = {}
         self.__maxCatapultUses = 3
         self.__initializeCatapultUsage(catapultUsage)
 
+    def __initializeShotPatterns(self) -> None:
+        """
+        Precomputes curved shot patterns for every range in the tank settings, with and without the range bonus.
+        """
+        for settings in Settings.TANKS.values():
+            if "minAttackRange" in settings:
+                self.__getCurvedMask(settings["minAttackRange"], settings["maxAttackRange"])
+                self.__getCurvedMask(settings["minAttackRange"], settings["maxAttackRange"] + 1)
+
+    def __getCurvedMask(self, minAttackRange: int, maxAttackRange: int) -> tuple[positionTuple, ...]:
+        """
+        Returns the offsets of all hexes within the given attack range, relative to the shooter.
+
+        :param minAttackRange: The minimum attack range.
+        :param maxAttackRange: The maximum attack range.
+        :return: A tuple of offsets.
+        """
+        mask = self.__curvedMasks.get((minAttackRange, maxAttackRange))
+
+        if mask is None:
+            mask = tuple((x, y, -x - y) for x in range(-maxAttackRange, maxAttackRange + 1)
+                         for y in range(-maxAttackRange, maxAttackRange + 1)
+                         if minAttackRange <= (abs(x) + abs(y) + abs(x + y)) // 2 <= maxAttackRange)
+            self.__curvedMasks[(minAttackRange, maxAttackRange)] = mask
+
+        return mask
+
+    def __initializeLinesOfFire(self) -> None:
+        """
+        Precomputes the lines of fire from every hex in every direction.
+
+        A line of fire follows the direction until it leaves the map or reaches a hex that can't be shot through.
+        """
+        shootThrough = HexFlags.SHOOT_THROUGH.value
+        self.__linesOfFire = {}
+
+        for position in self.__map.getPositions():
+            lines = []
+            for direction in HEX_DIRECTIONS:
+                line = []
+                currentPosition = tuple(x + y for x, y in zip(position, direction))
+                while self.__map.flagsAt(currentPosition) & shootThrough:
+                    line.append(currentPosition)
+                    currentPosition = tuple(x + y for x, y in zip(currentPosition, direction))
+                lines.append(tuple(line))
+            self.__linesOfFire[position] = tuple(lines)
+
+    def getLinesOfFire(self) -> dict:
+        """
+        Gets the precomputed lines of fire, which don't change during the game.
+
+        :return: A dictionary of positions and the lines of fire from them, one in every direction.
+        """
+        return self.__linesOfFire
+
     def getAttackMatrix(self):
         return self.__attackMatrix
 
@@ -72,8 +128,7 @@ class TankShootingSystem:
         :param catapultUsage: A history of catapult usage. Catapults can be used a limited number of times.
         """
 
-        for hex in catapultUsage:
-            position = hexToTuple(hex)
+        for position in catapultUsage:
             if position not in self.__catapultUsage:
                 self.__catapultUsage[position] = 1
             else:
@@ -164,7 +219,10 @@ class TankShootingSystem:
         :param newPosition: New position of the tank.
         """
         if tankId in self.__tanks:
-            self.__tankMap.pop(self.__tanks[tankId]["position"])
+            # another tank may have already moved into the old position
+            oldPosition = self.__tanks[tankId]["position"]
+            if self.__tankMap.get(oldPosition) == tankId:
+                self.__tankMap.pop(oldPosition)
             self.__tanks[tankId]["position"] = newPosition
             self.__tankMap[newPosition] = tankId
 
@@ -235,17 +293,6 @@ class TankShootingSystem:
 
         return True
 
-    def __distance(self, position1: positionTuple, position2: positionTuple) -> int:
-        """
-        Returns the distance between two positions.
-
-        :param position1: The first position.
-        :param position2: The second position.
-        :return: The distance between the two positions.
-        """
-        return (abs(position1[0] - position2[0]) + abs(position1[1] - position2[1]) + abs(
-            position1[2] - position2[2])) // 2
-
     def __getCurvedShootingOptions(self, shooterTankId: str) -> shootingOptionsList:
         """
         Returns a list of curved shooting options for the specified tank.
@@ -264,7 +311,7 @@ class TankShootingSystem:
             if not (self.__canAttack(shooterTankId, shooterOwnerId, tankId, tankComponents["owner"])):
                 continue
             targetPosition = tankComponents["position"]
-            distance = self.__distance(shooterPosition, targetPosition)
+            distance = self.__map.getDistance(shooterPosition, targetPosition)
 
             if shootingComponent.minAttackRange <= distance <= shootingComponent.maxAttackRange:
                 shootingOptions.append((targetPosition, [tankId]))
@@ -284,19 +331,19 @@ class TankShootingSystem:
         :return: A list of tank IDs that can be hit by direct shooting.
         """
         targets = []
+        directionIndex = self.__directionIndices.get(targetPermutation)
 
-        for distance in range(1, maxAttackDistance + 1):
-            currentPosition = tuple(x + y * distance for x, y in zip(startingPosition, targetPermutation))
-            if self.__map.objectAt(currentPosition) in self.__canShootTrough:
-                targetTankId = self.__tankMap.get(currentPosition)
+        if directionIndex is None:
+            return targets
 
-                if not targetTankId:
-                    continue
+        for currentPosition in self.__linesOfFire[startingPosition][directionIndex][:maxAttackDistance]:
+            targetTankId = self.__tankMap.get(currentPosition)
 
-                if self.__canAttack(shooterTankId, ownerId, targetTankId, self.__tanks[targetTankId]["owner"]):
-                    targets.append(targetTankId)
-            else:
-                break
+            if not targetTankId:
+                continue
+
+            if self.__canAttack(shooterTankId, ownerId, targetTankId, self.__tanks[targetTankId]["owner"]):
+                targets.append(targetTankId)
 
         return targets
 
@@ -314,7 +361,7 @@ class TankShootingSystem:
         shooterPosition = self.__tanks[shooterTankId]["position"]
         shootingComponent = self.__tanks[shooterTankId]["shooting"]
 
-        for permutation in self.__hexPermutations:
+        for permutation in HEX_DIRECTIONS:
             shootingDirection = tuple(x + y for x, y in zip(shooterPosition, permutation))
             shootingOptions.append((shootingDirection,
                                     self.__getDirectShootingTargets(shooterTankId, shooterOwnerId, shooterPosition,
@@ -339,8 +386,8 @@ class TankShootingSystem:
                 targets = []
                 if not targetPosition in self.__tankMap:
                     pass
-                if shootingComponent.minAttackRange > self.__distance(targetPosition,
-                                                                      shooterPosition) > shootingComponent.maxAttackRange:
+                if shootingComponent.minAttackRange > self.__map.getDistance(targetPosition,
+                                                                             shooterPosition) > shootingComponent.maxAttackRange:
                     pass
 
                 targetId = self.__tankMap[targetPosition]
@@ -350,10 +397,6 @@ class TankShootingSystem:
             elif isinstance(shootingComponent, DirectShootingComponent):
                 targets = []
                 permutation = tuple(x - y for x, y in zip(targetPosition, shooterPosition))
-
-                if not permutation in self.__hexPermutations:
-                    pass
-
                 targets = self.__getDirectShootingTargets(shooterId, shooterOwnerId, shooterPosition, permutation,
                                                           shootingComponent.maxAttackDistance)
             else:
@@ -407,30 +450,17 @@ class TankShootingSystem:
         if shooterPosition is None:
             shooterPosition = self.__tanks[shooterTankId]["position"]
         shootingComponent = self.__tanks[shooterTankId]["shooting"]
+        attackRange = (shootingComponent.minAttackRange, shootingComponent.maxAttackRange)
+        shootablePositions = self.__shootablePositions.get((shooterPosition, attackRange))
 
-        visited = set()  # Set to store visited positions
-        visited.add(shooterPosition) 
-        result = []  # List to store valid movement options
-        queue = deque()
-        queue.append(((shooterPosition), 0))
-
-        # Perform breadth-first search to find all possible moves
-        while len(queue) > 0:
-            currentPosition, currentDistance = queue.popleft()
+        if shootablePositions is None:
+            x, y, z = shooterPosition
+            shootablePositions = tuple(position for position in
+                                       ((x + dx, y + dy, z + dz) for dx, dy, dz in self.__getCurvedMask(*attackRange))
+                                       if self.__map.getCellId(position) is not None)
+            self.__shootablePositions[(shooterPosition, attackRange)] = shootablePositions
 
-            if currentDistance >= shootingComponent.minAttackRange:
-                result.append(currentPosition)
-
-            if currentDistance + 1 > shootingComponent.maxAttackRange:
-                continue
-
-            for permutation in self.__hexPermutations:
-                newPosition = tuple(x + y for x, y in zip(currentPosition, permutation))
-                if all(abs(pos) < self.__mapSize for pos in newPosition) and not newPosition in visited:
-                    visited.add(newPosition)
-                    queue.append(((newPosition), currentDistance + 1))
-
-        return result
+        return list(shootablePositions)
 
     def __getDirectShootablePositions(self, shooterTankId: str, shooterPosition: positionTuple = None) -> list[positionTuple]:
         """
@@ -442,20 +472,17 @@ class TankShootingSystem:
                     the current position of the tank.
         :return: A list of shooting options, where each option is represented as a position tuple
         """
-        shootingOptions = []
         if shooterPosition is None:
             shooterPosition = self.__tanks[shooterTankId]["position"]
-        shootingComponent = self.__tanks[shooterTankId]["shooting"]
+        maxAttackDistance = self.__tanks[shooterTankId]["shooting"].maxAttackDistance
+        shootablePositions = self.__shootablePositions.get((shooterPosition, maxAttackDistance))
 
-        for permutation in self.__hexPermutations:
-            for distance in range(1, shootingComponent.maxAttackDistance + 1):
-                shootingPosition = tuple(x + y * distance for x, y in zip(shooterPosition, permutation))
-                if self.__map.objectAt(shooterPosition) in self.__canShootTrough:
-                    shootingOptions.append(shootingPosition)
-                else:
-                    break
+        if shootablePositions is None:
+            shootablePositions = tuple(position for line in self.__linesOfFire[shooterPosition]
+                                       for position in line[:maxAttackDistance])
+            self.__shootablePositions[(shooterPosition, maxAttackDistance)] = shootablePositions
 
-        return shootingOptions
+        return list(shootablePositions)
     
     def turn(self, ownerId: int) -> None:
         """
@@ -466,6 +493,35 @@ class TankShootingSystem:
         if ownerId in self.__attackMatrix:
             self.__attackMatrix[ownerId].clear()
 
+    def setRangeBonus(self, tankId: str, enabled: bool) -> None:
+        """
+        Enables or disables the range bonus of a tank, without using a catapult.
+
+        :param tankId: The ID of the tank.
+        :param enabled: True if the tank should have the range bonus.
+        """
+        tank = self.__tanks.get(tankId)
+
+        if tank and tank["shooting"].rangeBonusEnabled != enabled:
+            if enabled:
+                self.__addBonusRange(tank["shooting"])
+            else:
+                self.__removeBonusRange(tank["shooting"])
+
+    def setHistory(self, attackMatrix: jsonDict, catapultUsage: list) -> None:
+        """
+        Replaces the attack matrix and the catapult usage with the ones from the server, keeping the tanks.
+
+        :param attackMatrix: A dictionary containing attack matrix from the server.
+        :param catapultUsage: A history of catapult usage from the server.
+        """
+        self.__initializeAttackMatrix(attackMatrix)
+        for tank in self.__tanks.values():
+            self.__attackMatrix.setdefault(tank["owner"], [])
+
+        self.__catapultUsage.clear()
+        self.__initializeCatapultUsage(catapultUsage)
+
     def reset(self, attackMatrix: jsonDict, catapultUsage: list) -> None:
         """
         Resets the system to it's initial state.
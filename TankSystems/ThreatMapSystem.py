@@ -0,0 +1,113 @@
+from Events.Events import TankAddedEvent
+from Events.EventManager import EventManager
+from Map import Map
+from Tanks.Tank import Tank
+
+
+class ThreatMapSystem:
+    """
+    A system that keeps track of the damage that groups of tanks can deal to every hex on the map.
+    """
+
+    def __init__(self, map: Map, eventManager: EventManager, shootingSystem) -> None:
+        """
+        Initializes the ThreatMapSystem.
+
+        :param map: An instance of the Map that holds static game information.
+        :param eventManager: The EventManager instance to use for triggering events.
+        :param shootingSystem: The TankShootingSystem used to find the positions a tank can shoot at.
+        """
+        self.__eventManager = eventManager
+        self.__eventManager.addHandler(TankAddedEvent, self.onTankAdded)
+        self.__map = map
+        self.__shootingSystem = shootingSystem
+        self.__tanks = {}
+        self.__contributions = {}  # dict[tankId, (key, hex ids the tank can shoot at, damage)]
+        self.__threatMaps = {}  # dict[tuple of tankIds, (damage per hex id, contributions used)]
+
+    def onTankAdded(self, tankId: str, tankEntity: Tank) -> None:
+        """
+        Event handler. Adds the tank to the system if it has position and shooting components.
+
+        :param tankId: The ID of the added tank.
+        :param tankEntity: The Tank entity that was added.
+        """
+        positionComponent = tankEntity.getComponent("position")
+        shootingComponent = tankEntity.getComponent("shooting")
+
+        if positionComponent and shootingComponent:
+            self.__tanks[tankId] = {
+                "position": positionComponent,
+                "shooting": shootingComponent,
+            }
+
+    def __getContribution(self, tankId: str) -> tuple:
+        """
+        Gets the hexes a tank can shoot at, recomputing them only if its position or shooting stats changed.
+
+        :param tankId: The ID of the tank.
+        :return: A tuple containing the contribution key, a tuple of hex ids and the damage of the tank.
+        """
+        tankData = self.__tanks[tankId]
+        shootingComponent = tankData["shooting"]
+        key = (tankData["position"].position, *vars(shootingComponent).values())
+        contribution = self.__contributions.get(tankId)
+
+        if contribution is None or contribution[0] != key:
+            cellIds = []
+            for position in self.__shootingSystem.getShootablePositions(tankId):
+                cellId = self.__map.getCellId(position)
+                if cellId is not None:
+                    cellIds.append(cellId)
+
+            contribution = (key, tuple(cellIds), shootingComponent.damage)
+            self.__contributions[tankId] = contribution
+
+        return contribution
+
+    def getDamages(self, tankIds: list[str]) -> list[int]:
+        """
+        Returns the total damage the given tanks can deal to every hex on the map.
+
+        Threat maps are kept for every group of tanks that was asked for. Only the tanks that moved or had
+        their shooting range changed since the last call are subtracted from and added back to the map.
+
+        :param tankIds: The IDs of the tanks that are shooting.
+        :return: A list of total damages indexed by hex id. The list must not be modified.
+        """
+        groupKey = tuple(tankIds)
+        threatMap = self.__threatMaps.get(groupKey)
+
+        if threatMap is None:
+            threatMap = ([0] * self.__map.getCellCount(), {})
+            self.__threatMaps[groupKey] = threatMap
+
+        damages, usedContributions = threatMap
+
+        for tankId in tankIds:
+            contribution = self.__getContribution(tankId)
+            usedContribution = usedContributions.get(tankId)
+
+            if usedContribution is contribution:
+                continue
+
+            if usedContribution is not None:
+                _, cellIds, damage = usedContribution
+                for cellId in cellIds:
+                    damages[cellId] -= damage
+
+            _, cellIds, damage = contribution
+            for cellId in cellIds:
+                damages[cellId] += damage
+
+            usedContributions[tankId] = contribution
+
+        return damages
+
+    def reset(self) -> None:
+        """
+        Resets the system to it's initial state.
+        """
+        self.__tanks.clear()
+        self.__contributions.clear()
+        self.__threatMaps.clear()
@@ -1,21 +1,22 @@
 from Tanks.Components.DirectShootingComponent import DirectShootingComponent
 from Tanks.Tank import Tank
-from Aliases import jsonDict, shootingOptionsList
+from Aliases import shootingOptionsList
+from GameData import VehicleData
 import Tanks.Settings as Settings
 
 
 class AT_SPG(Tank):
     __slots__ = ()
 
-    def __init__(self, tankData: jsonDict) -> None:
+    def __init__(self, tankData: VehicleData) -> None:
         """
         Initializes a tank destroyer.
 
-        :param tankData: A dictionary containing all the data of the tank entity.
+        :param tankData: The data of the tank entity from the game state.
         """
         super().__init__(tankData, Settings.TANKS["AT_SPG"])
 
-    def _initializeShooting(self, settings: jsonDict, shootingRangeBonus: bool) -> None:
+    def _initializeShooting(self, settings: dict[str, int], shootingRangeBonus: bool) -> None:
         """
         Overrides initialization of the shooting component for the AT-SPG tank.
 
@@ -1,14 +1,14 @@
 from Tanks.Tank import Tank
-from Aliases import jsonDict
+from GameData import VehicleData
 import Tanks.Settings as Settings
 
 class LIGHT_TANK(Tank):
     __slots__ = ()
 
-    def __init__(self, tankData: jsonDict) -> None:
+    def __init__(self, tankData: VehicleData) -> None:
         """
         Initializes a light tank.
 
-        :param tankData: A dictionary containing all the data of the tank entity.
+        :param tankData: The data of the tank entity from the game state.
         """
         super().__init__(tankData, Settings.TANKS["LIGHT_TANK"])
\ No newline at end of file
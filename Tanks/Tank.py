@@ -7,7 +7,7 @@ from Tanks.Components.CurvedShootingComponent import CurvedShootingComponent
 from Tanks.Components.OwnerComponent import OwnerComponent
 from Aliases import positionTuple, shootingOptionsList
 from Aliases import jsonDict
-from Utils import hexToTuple
+from GameData import VehicleData
 
 
 class Tank(ABC):
@@ -16,28 +16,21 @@ class Tank(ABC):
     """
     __slots__ = ("__components",)
 
-    def __init__(self, tankData: jsonDict, settings: jsonDict) -> None:
+    def __init__(self, tankData: VehicleData, settings: jsonDict) -> None:
         """
         Initializes a new instance of the Tank class.
 
-        :param tankData: A dictionary containing all the data of the tank entity.
+        :param tankData: The data of the tank entity from the game state.
         :param settings: A dictionary containing all the settings of the tank entity.
         """
         self.__components = {}
 
-        spawnPosition = hexToTuple(tankData["spawn_position"])
-        position = hexToTuple(tankData["position"])
-        ownerId = tankData["player_id"]
-        currentHealth = tankData["health"]
-        capturePoints = tankData["capture_points"]
-        shootingRangeBonus = bool(tankData["shoot_range_bonus"])
-
-        self._initializePosition(spawnPosition, position, settings["sp"])
-        self._initializeOwner(ownerId)
+        self._initializePosition(tankData.spawnPosition, tankData.position, settings["sp"])
+        self._initializeOwner(tankData.playerId)
         self._initializeDestructionReward(settings["destructionPoints"])
-        self._initializeHealth(settings["hp"], currentHealth)
-        self._initializeCapture(capturePoints)
-        self._initializeShooting(settings, shootingRangeBonus)
+        self._initializeHealth(settings["hp"], tankData.health)
+        self._initializeCapture(tankData.capturePoints)
+        self._initializeShooting(settings, tankData.shootRangeBonus)
 
     def _initializePosition(self, spawnPosition: positionTuple, position: positionTuple, speed: int) -> None:
         """
@@ -1,61 +1,81 @@
 from Map import Map
 from Events.EventManager import EventManager
+from Events.EventStatistics import EventStatistics
 from TankManagement.TankManager import TankManager
 from TankSystems.TankMovementSystem import TankMovementSystem
 from TankSystems.TankShootingSystem import TankShootingSystem
 from TankSystems.TankHealthSystem import TankHealthSystem
-from TankSystems.DisplaySystem import DisplaySystem
+from TankSystems.NullDisplaySystem import NullDisplaySystem
 from TankSystems.TankRespawnSystem import TankRespawnSystem
 from TankSystems.PositionBonusSystem import PositionBonusSystem
 from TankSystems.BaseCaptureSystem import BaseCaptureSystem
+from TankSystems.ThreatMapSystem import ThreatMapSystem
 import inspect
 import Events.Events as AllEvents
+from Events.Events import TankRespawnedEvent, TankShotEvent, TankRepairedEvent
 from Aliases import jsonDict, positionTuple
+from Constants import Action
+from Utils import hexToTuple
 from Bot import Bot
 from Entities.EntityManagementSystem import EntityManagementSystem
 
 
 class World:
-    def __init__(self, map: jsonDict, gameState: jsonDict, playerId: int) -> None:
+    def __init__(self, map: jsonDict, gameState: jsonDict, playerId: int, workers: int = 0,
+                 eventStatistics: bool = False, headless: bool = False) -> None:
         """
         Initializes the game world.
 
         :param map: A dictionary containing the map data.
         :param gameState: A dictionary containing the game state data.
+        :param workers: (Optional) The number of worker processes the bot's search is split between.
+        :param eventStatistics: (Optional) If True, statistics of the events are recorded.
+        :param headless: (Optional) If True, the game isn't displayed.
         """
         self.__playerId = playerId
         self.__map = Map(map)
-        self.__initializeEventManager()
+        self.__initializeEventManager(eventStatistics)
         self.__tankManager = TankManager(self.__eventManager)
-        self.__initializeSystems(gameState)
+        self.__initializeSystems(gameState, headless)
         self.__bot = Bot(self.__map, self.__eventManager, self.__movementSystem, self.__shootingSystem,
-                         self.__entityManagementSystem)
+                         self.__threatMapSystem, self.__entityManagementSystem, workers)
 
-    def __initializeEventManager(self) -> None:
+    def __initializeEventManager(self, eventStatistics: bool) -> None:
         """
         Initializes the event manager.
+
+        :param eventStatistics: If True, statistics of the events are recorded.
         """
         self.__eventManager = EventManager()
+        if eventStatistics:
+            self.__eventManager.enableStatistics()
 
         # init all events
         allEvents = inspect.getmembers(AllEvents, inspect.isclass)
         for _, cls in allEvents:
             self.__eventManager.registerEvent(cls)
 
-    def __initializeSystems(self, gameState: jsonDict) -> None:
+    def __initializeSystems(self, gameState: jsonDict, headless: bool) -> None:
         """
         Initializes the various systems used in the game world.
 
         :param gameState: A dictionary containing the game state data.
+        :param headless: If True, the display system is replaced by one that does nothing.
         """
         self.__movementSystem = TankMovementSystem(self.__map, self.__eventManager)
-        self.__displaySystem = DisplaySystem(self.__map, self.__eventManager)
+        if headless:
+            self.__displaySystem = NullDisplaySystem()
+        else:
+            # imported here, so that headless games don't need Tk
+            from TankSystems.DisplaySystem import DisplaySystem
+            self.__displaySystem = DisplaySystem(self.__map, self.__eventManager)
         self.__shootingSystem = TankShootingSystem(self.__map, self.__eventManager, gameState["attack_matrix"],
                                                    gameState["catapult_usage"])
         self.__healthSystem = TankHealthSystem(self.__eventManager)
         self.__respawnSystem = TankRespawnSystem(self.__eventManager)
         self.__positionBonusSystem = PositionBonusSystem(self.__map, self.__eventManager)
         self.__baseCaptureSystem = BaseCaptureSystem(self.__map, self.__eventManager)
+        self.__threatMapSystem = ThreatMapSystem(self.__map, self.__eventManager, self.__shootingSystem)
         self.__entityManagementSystem = EntityManagementSystem(gameState, self.__playerId)
 
     def resetSystems(self, gameState: jsonDict) -> None:
@@ -72,9 +92,62 @@ class World:
         self.__respawnSystem.reset()
         self.__positionBonusSystem.reset()
         self.__baseCaptureSystem.reset()
+        self.__threatMapSystem.reset()
         self.__bot.reset()
         self.__entityManagementSystem.reset()
 
+    def reconcile(self, gameState: jsonDict) -> None:
+        """
+        Brings the world up to date with the game state, keeping the existing tanks, systems and their caches.
+
+        Only the differences are applied, through the same events the game itself triggers.
+        Falls back to resetting the systems if the game state has a different set of tanks.
+
+        :param gameState: A dictionary containing the game state data.
+        """
+        vehicles = {str(tankId): tankData for tankId, tankData in gameState["vehicles"].items()}
+        if set(vehicles) != set(self.__tankManager.getTankIds()):
+            self.resetSystems(gameState)
+            return
+
+        tanks = {tankId: self.__tankManager.getTank(tankId) for tankId in vehicles}
+
+        # tanks in the game state are alive, so tanks destroyed locally have already respawned
+        self.__respawnSystem.reset()
+        with self.__eventManager.batch():
+            for tankId, tank in tanks.items():
+                if tank.getComponent("health").currentHealth <= 0:
+                    self.__eventManager.triggerEvent(TankRespawnedEvent, tankId)
+
+        for tankId, tank in tanks.items():
+            tankData = vehicles[tankId]
+            if tank.getComponent("position").position != tankData.position:
+                self.__movementSystem.move(tankId, tankData.position)
+
+            healthComponent = tank.getComponent("health")
+            health = tankData.health
+            if health < healthComponent.currentHealth:
+                self.__eventManager.triggerEvent(TankShotEvent, tankId, healthComponent.currentHealth - health)
+            elif health == healthComponent.maxHealth and health > healthComponent.currentHealth:
+                self.__eventManager.triggerEvent(TankRepairedEvent, tankId)
+            else:
+                healthComponent.currentHealth = health
+
+            self.__shootingSystem.setRangeBonus(tankId, tankData.shootRangeBonus)
+            tank.getComponent("capture").capturePoints = tankData.capturePoints
+
+        self.__shootingSystem.setHistory(gameState["attack_matrix"], gameState["catapult_usage"])
+        self.__entityManagementSystem.addMissingEntities(gameState)
+        self.__entityManagementSystem.updatePoints(gameState)
+
+    def getEventStatistics(self) -> EventStatistics | None:
+        """
+        Gets the statistics of the events.
+
+        :return: The statistics, or None if they aren't recorded.
+        """
+        return self.__eventManager.getStatistics()
+
     def getEntityManagementSystem(self):
         return self.__entityManagementSystem
 
@@ -92,10 +165,11 @@ class World:
 
         :param gameState: A dictionary containing the game state data.
         """
-        for tankId, tankData in gameState["vehicles"].items():
-            tankId = str(tankId)
-            if not self.__tankManager.hasTank(tankId):
-                self.__tankManager.addTank(tankId, tankData)
+        with self.__eventManager.batch():
+            for tankId, tankData in gameState["vehicles"].items():
+                tankId = str(tankId)
+                if not self.__tankManager.hasTank(tankId):
+                    self.__tankManager.addTank(tankId, tankData)
 
     def shoot(self, tankId: str, targetPosition: positionTuple) -> None:
         """
@@ -115,6 +189,51 @@ class World:
         """
         self.__movementSystem.move(tankId, targetPosition)
 
+    def applyGameActions(self, gameActions: list[jsonDict], playerId: int) -> bool:
+        """
+        Applies the actions of another player's turn, as returned by GAME_ACTIONS.
+
+        Each action is checked against the world before it is applied.
+
+        :param gameActions: A list of actions, each a dictionary with player_id, action_type and data keys.
+        :param playerId: The ID of the player whose turn it was.
+        :return: True if all the actions were applied, False if an action didn't match the world.
+            The world is then partially updated and has to be reset.
+        """
+        for gameAction in gameActions:
+            actionType = gameAction["action_type"]
+            if actionType == Action.CHAT.value:
+                continue
+
+            data = gameAction["data"]
+            tankId = str(data["vehicle_id"])
+            if gameAction["player_id"] != playerId or not self.__tankManager.hasTank(tankId) \
+                    or self.__tankManager.getTank(tankId).getComponent("owner").ownerId != playerId:
+                return False
+
+            targetPosition = hexToTuple(data["target"])
+            if actionType == Action.MOVE.value:
+                if targetPosition not in self.__movementSystem.getMovementOptions(tankId):
+                    return False
+                self.move(tankId, targetPosition)
+            elif actionType == Action.SHOOT.value:
+                shootingOptions = self.__shootingSystem.getShootingOptions(tankId)
+                if all(position != targetPosition for position, _ in shootingOptions):
+                    return False
+                self.shoot(tankId, targetPosition)
+            else:
+                return False
+
+        return True
+
+    def isCaptureWithinReach(self) -> bool:
+        """
+        Checks if a player may win by capturing the base at the end of the current round.
+
+        :return: True if the game may finish by a base capture, False otherwise.
+        """
+        return self.__baseCaptureSystem.isCaptureWithinReach()
+
     def getBot(self) -> Bot:
         """
         Gets the game's bot.
@@ -130,8 +249,11 @@ class World:
         :param gameState: currentGame state at the end of the turn.
         """
         currentPlayer = gameState["current_player_idx"]
-        self.__respawnSystem.turn()
-        self.__positionBonusSystem.turn()
+        # events of each phase are dispatched together once the phase is over
+        with self.__eventManager.batch():
+            self.__respawnSystem.turn()
+        with self.__eventManager.batch():
+            self.__positionBonusSystem.turn()
         self.__baseCaptureSystem.turn()
         self.__displaySystem.turn()
         self.__shootingSystem.turn(currentPlayer)
@@ -147,6 +269,7 @@ class World:
 
     def quit(self):
         """
-        Quits the game by closing the display.
+        Quits the game by closing the display and the bot's worker processes.
         """
+        self.__bot.close()
         self.__displaySystem.quit()
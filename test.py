@@ -1,9 +1,13 @@
+import asyncio
 import logging
 import random
 import string
+import sys
 from threading import Thread
 from Game import Game
 from PlayerSession import PlayerSession
+from AsyncPlayerSession import AsyncPlayerSession
+from GameData import shapeMap, shapeGameState
 
 
 def runOneWithUserName():
@@ -46,19 +50,138 @@ def runAutomatically(numPlayers: int, numTurns: int, iteration: int):
         thread.join()
 
 
+async def __asyncPlayerBody(data, playerName):
+    """
+    Plays a game by only passing turns, exercising the server protocol.
+    """
+    async with AsyncPlayerSession(playerName, "") as session:
+        await session.login(dict(data))
+        await session.getMapInfo()
+        gameState = await session.getGameState()
+        while not gameState["finished"]:
+            await session.nextTurn()
+            gameState = await session.getGameState()
+
+        await session.logout()
+        return gameState["winner"]
+
+
+async def runLoadTest(numPlayers: int, numTurns: int, numGames: int):
+    """
+    Runs games with passive players concurrently on one event loop.
+
+    :return: The winners of the games.
+    """
+    letters = string.ascii_letters
+    bodies = []
+    for i in range(numGames):
+        data = {"game": "load" + ''.join(random.choice(letters) for _ in range(10)), "num_turns": numTurns,
+                "num_players": numPlayers, "is_full": True}
+        for _ in range(numPlayers):
+            playerName = ''.join(random.choice(letters) for _ in range(10))  # player name
+            bodies.append(__asyncPlayerBody(data, playerName))
+
+    return await asyncio.gather(*bodies)
+
+
+class EarlyFinishSession:
+    """
+    A session with a scripted server, on which the second player wins by capturing the base before the last turn.
+    """
+
+    def __init__(self, finishTurn: int) -> None:
+        """
+        :param finishTurn: The turn on which the base is captured and the game finishes.
+        """
+        self.finishTurn = finishTurn
+        self.gameStateRequests = 0
+        self.__currentTurn = 0
+
+    def __hexes(self, radius: int, distance: int) -> list[dict]:
+        return [{"x": x, "y": y, "z": -x - y} for x in range(-radius, radius + 1)
+                for y in range(max(-radius, -x - radius), min(radius, radius - x) + 1)
+                if max(abs(x), abs(y), abs(x + y)) == distance]
+
+    def login(self, data) -> int:
+        return 1
+
+    def logout(self) -> None:
+        pass
+
+    def getMapInfo(self):
+        return shapeMap({"size": 11, "name": "early finish", "spawn_points": [],
+                         "content": {"base": self.__hexes(1, 0) + self.__hexes(1, 1), "obstacle": [], "catapult": [],
+                                     "light_repair": [], "hard_repair": []}})
+
+    def getGameState(self):
+        self.gameStateRequests += 1
+        finished = self.__currentTurn >= self.finishTurn
+        vehicles = {}
+        vehicleTypes = ("spg", "light_tank", "heavy_tank", "medium_tank", "at_spg")
+        spawns = {1: self.__hexes(10, 10)[:5], 2: self.__hexes(1, 1)[:5], 3: self.__hexes(10, 10)[-5:]}
+        for playerId, positions in spawns.items():
+            for i, position in enumerate(positions):
+                # the second player's tanks sit in the base one round short of capturing it
+                capturePoints = 1 if playerId == 2 else 0
+                if playerId == 2 and finished:
+                    capturePoints = 2
+                vehicles[str(5 * (playerId - 1) + i + 1)] = {
+                    "player_id": playerId, "vehicle_type": vehicleTypes[i], "health": 1, "spawn_position": position,
+                    "position": position, "capture_points": capturePoints, "shoot_range_bonus": 0}
+
+        return shapeGameState({
+            "num_players": 3, "num_turns": 45, "current_turn": self.__currentTurn,
+            "current_player_idx": self.__currentTurn % 3 + 1, "finished": finished, "winner": 2 if finished else None,
+            "current_round": 1, "num_rounds": 1, "observers": [], "vehicles": vehicles,
+            "players": [{"idx": playerId, "name": str(playerId), "is_observer": False} for playerId in (1, 2, 3)],
+            "attack_matrix": {"1": [], "2": [], "3": []}, "catapult_usage": [],
+            "win_points": {str(playerId): {"capture": 10 if playerId == 2 and finished else 0, "kill": 0}
+                           for playerId in (1, 2, 3)}})
+
+    def getGameActions(self):
+        return {"actions": []}
+
+    def nextTurn(self) -> None:
+        assert self.__currentTurn < self.finishTurn, "the game went on after it finished"
+        self.__currentTurn += 1
+
+    def pipeline(self, requests):
+        self.nextTurn()
+        return [{} for _ in requests]
+
+
+def runEarlyFinishTest():
+    """
+    Plays a game that finishes early by a base capture, following the other players' turns through their actions.
+    """
+    session = EarlyFinishSession(finishTurn=4)
+    game = Game(session, {}, deltaSync=True, headless=True)
+    game.quit()
+
+    assert not game.isWinner()
+    # the game state is fetched on start and when the capture is within reach, which is every turn here
+    assert session.gameStateRequests == session.finishTurn + 1
+    print("Early finish detected")
+
+
 if __name__ == "__main__":
     # logging.basicConfig(level=logging.DEBUG)
     winners = []
-    runOneWithUserName()
-"""
-Code for automatic running of threads
-winners = []
-winByPlayer = [0, 0, 0]
-numGames = 5
-for i in range(numGames):
-    runAutomatically(3, 99, i)
-for winner in winners:
-    winByPlayer[winner] += 1
-
-print(winByPlayer)
-"""
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command == "earlyfinish":
+        runEarlyFinishTest()
+    elif command == "automatic":
+        # automatic running of threads, counting the wins of each player
+        winByPlayer = [0, 0, 0]
+        numGames = 5
+        for i in range(numGames):
+            runAutomatically(3, 99, i)
+        for winner in winners:
+            winByPlayer[winner] += 1
+
+        print(winByPlayer)
+    elif command == "loadtest":
+        # a load test with many sessions on one event loop
+        print(asyncio.run(runLoadTest(3, 45, 10)))
+    else:
+        runOneWithUserName()